@@ -1,7 +1,8 @@
 # app/api/v1/api.py
 from fastapi import APIRouter
-from app.api.v1.endpoints import disasters, reports
+from app.api.v1.endpoints import disasters, jobs, reports
 
 api_router = APIRouter()
 api_router.include_router(disasters.router, prefix="/disasters", tags=["disasters"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -1,19 +1,41 @@
 from typing import Any, List, Literal, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
 from app.core.config import settings
 from app.models.disaster import Disaster
-from app.models.report import Report
-from app.schemas.disaster import DisasterList, DisasterDetail
+from app.models.disaster_summary import disaster_summary
+from app.schemas.analysis import Analysis
+from app.schemas.disaster import DisasterList, DisasterDetail, DisasterSummary
+from app.schemas.job import AnalysisJob
 from app.api import deps
-from app.utils.pdf_extractor import extract_text_from_pdf_url, pdf_to_base64_pngs
-from app.utils.ai_analysis import generate_map_analysis, generate_report_analysis
+from app.utils.disaster_analysis import (
+    ANALYSIS_COLUMNS,
+    get_cached_analysis,
+    get_latest_source_report,
+)
+from app.utils.job_queue import enqueue_analysis_job
+from app.utils.pagination import paginate, set_next_cursor
+from app.utils.response_cache import cached_response
 from enum import Enum
 
 router = APIRouter()
 
+# Columns serialized by DisasterList
+DISASTER_LIST_COLUMNS = load_only(
+    Disaster.id,
+    Disaster.name,
+    Disaster.status,
+    Disaster.date_event,
+    Disaster.date_changed,
+    Disaster.primary_country,
+    Disaster.primary_type,
+    Disaster.report_analysis,
+)
+
 
 class Language(str, Enum):
     ENGLISH = "en"
@@ -23,52 +45,109 @@ class Language(str, Enum):
 
 @router.get("/", response_model=List[DisasterList])
 async def read_disasters(
+    request: Request,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: Optional[Literal["alert", "ongoing"]] = None,
 ) -> Any:
-    query = (
-        select(Disaster).order_by(desc(Disaster.date_changed)).offset(skip).limit(limit)
-    )
-    if status:
-        query = query.filter(Disaster.status == status)
-    result = await db.execute(query)
-    disasters = result.scalars().all()
-    return [DisasterList.model_validate(disaster) for disaster in disasters]
+    async def build(response: Response):
+        query = select(Disaster).options(DISASTER_LIST_COLUMNS)
+        if status:
+            query = query.filter(Disaster.status == status)
+        result = await db.execute(paginate(query, Disaster, skip, limit, cursor))
+        disasters = result.scalars().all()
+        set_next_cursor(response, disasters, limit)
+        return [DisasterList.model_validate(disaster) for disaster in disasters]
+
+    return await cached_response(request, build)
+
+
+@router.get("/summary", response_model=List[DisasterSummary])
+async def read_disaster_summaries(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[Literal["alert", "ongoing"]] = None,
+) -> Any:
+    # Compact rows precomputed for dashboard lists, without the analyses
+    async def build(response: Response):
+        query = select(disaster_summary)
+        if status:
+            query = query.filter(disaster_summary.c.status == status)
+        result = await db.execute(
+            paginate(query, disaster_summary.c, skip, limit, cursor)
+        )
+        summaries = result.all()
+        set_next_cursor(response, summaries, limit)
+        return [DisasterSummary.model_validate(summary) for summary in summaries]
+
+    return await cached_response(request, build)
 
 
 @router.get("/filter", response_model=List[DisasterList])
 async def filter_disasters(
+    request: Request,
     db: AsyncSession = Depends(deps.get_db),
     status: Literal["alert", "ongoing"] = Query(..., description="Status to filter by"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
-    query = (
-        select(Disaster)
-        .filter(Disaster.status == status)
-        .order_by(desc(Disaster.date_changed))
-        .offset(skip)
-        .limit(limit)
-    )
-    result = await db.execute(query)
-    disasters = result.scalars().all()
-    return [DisasterList.model_validate(disaster) for disaster in disasters]
+    async def build(response: Response):
+        query = (
+            select(Disaster)
+            .options(DISASTER_LIST_COLUMNS)
+            .filter(Disaster.status == status)
+        )
+        result = await db.execute(paginate(query, Disaster, skip, limit, cursor))
+        disasters = result.scalars().all()
+        set_next_cursor(response, disasters, limit)
+        return [DisasterList.model_validate(disaster) for disaster in disasters]
+
+    return await cached_response(request, build)
 
 
 @router.get("/{disaster_id}", response_model=DisasterDetail)
 async def read_disaster(
-    disaster_id: int, db: AsyncSession = Depends(deps.get_db)
+    disaster_id: int, request: Request, db: AsyncSession = Depends(deps.get_db)
 ) -> Any:
-    result = await db.execute(select(Disaster).filter(Disaster.id == disaster_id))
-    disaster = result.scalar_one_or_none()
-    if not disaster:
-        raise HTTPException(status_code=404, detail="Disaster not found")
-    return DisasterDetail.model_validate(disaster)
+    async def build(response: Response):
+        result = await db.execute(select(Disaster).filter(Disaster.id == disaster_id))
+        disaster = result.scalar_one_or_none()
+        if not disaster:
+            raise HTTPException(status_code=404, detail="Disaster not found")
+        return DisasterDetail.model_validate(disaster)
+
+    return await cached_response(request, build)
+
+
+@router.get("/{disaster_id}/analysis", response_model=Analysis)
+async def read_analysis(
+    disaster_id: int,
+    analysis_type: Literal["report", "map", "news"] = Query(
+        ..., description="Type of analysis to read"
+    ),
+    lang: Language = Query(Language.ENGLISH, description="Language of the analysis"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> Any:
+    source = await get_latest_source_report(db, disaster_id, analysis_type)
+    analysis = await get_cached_analysis(
+        db, disaster_id, analysis_type, source.id, lang.value
+    )
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not available")
+    return Analysis.model_validate(analysis)
 
 
-@router.put("/{disaster_id}/analysis", response_model=DisasterDetail)
+@router.put(
+    "/{disaster_id}/analysis",
+    response_model=DisasterDetail,
+    responses={202: {"model": AnalysisJob, "description": "Analysis queued"}},
+)
 async def get_latest_report_analysis(
     disaster_id: int,
     analysis_type: Literal["report", "map", "news"] = Query(
@@ -85,168 +164,22 @@ async def get_latest_report_analysis(
     if not disaster:
         raise HTTPException(status_code=404, detail="Disaster not found")
 
-    match analysis_type:
-        case "report":
-            if not disaster.report_analysis:
-                disaster.report_analysis = await analyze_report(
-                    disaster_id, disaster.name, lang, db
-                )
-        case "map":
-            if not disaster.map_analysis:
-                disaster.map_analysis = await analyze_map(
-                    disaster_id, disaster.name, lang, db
-                )
-        case "news":
-            if not disaster.news_analysis:
-                disaster.news_analysis = await analyze_news(
-                    disaster_id, disaster.name, lang, db
-                )
-
-    # Commit the changes to the database
-    await db.commit()
-    await db.refresh(disaster)
-    return DisasterDetail.model_validate(disaster)
-
-
-async def analyze_report(
-    disaster_id: int, disaster_name: str, lang: str, db: AsyncSession
-) -> dict:
-    # Get the latest situation report for the disaster
-    report_result = await db.execute(
-        select(Report)
-        .filter(
-            Report.disaster_id == disaster_id,
-            Report.content_format_id == settings.CONTENT_FORMAT_SITUATION_REPORT,
-        )
-        .order_by(desc(Report.date_created))
-        .limit(1)
+    # Analyses are cached per source report, so a newer report is analyzed
+    # again
+    source = await get_latest_source_report(db, disaster_id, analysis_type)
+    analysis = await get_cached_analysis(
+        db, disaster_id, analysis_type, source.id, lang.value
     )
-    latest_report = report_result.scalar_one_or_none()
-    if not latest_report:
-        raise HTTPException(
-            status_code=404, detail="No situation report found for this disaster"
-        )
-
-    # Extract the text from the situation report
-    if latest_report.extracted_report:
-        extracted_text = latest_report.extracted_report
-    elif (
-        latest_report.file
-        and isinstance(latest_report.file, list)
-        and len(latest_report.file) > 0
-    ):
-        pdf_url = latest_report.file[0].get("url")
-        if not pdf_url:
-            raise HTTPException(
-                status_code=404, detail="No valid PDF URL found for the latest report"
-            )
-        extracted_text = await extract_text_from_pdf_url(pdf_url)
-        # Update the report with the extracted text
-        latest_report.extracted_report = extracted_text
-        await db.commit()
-    else:
-        raise HTTPException(
-            status_code=404,
-            detail="No content available for analysis in the latest report",
+    if analysis:
+        detail = DisasterDetail.model_validate(disaster)
+        return detail.model_copy(
+            update={ANALYSIS_COLUMNS[analysis_type]: analysis.result}
         )
 
-    # Perform AI analysis on the extracted text
-    report_analysis = await generate_report_analysis(
-        disaster_name, latest_report.title, extracted_text, lang
-    )
-
-    # Return the analysis results
-    return {
-        "latest_report_id": latest_report.id,
-        "latest_report_title": latest_report.title,
-        "latest_report_date": latest_report.date_created.isoformat(),
-        "latest_report_url": latest_report.url,
-        "latest_report_sources": latest_report.source,
-        "type": "report",
-        "analysis": report_analysis.model_dump(),
-    }
-
-
-async def analyze_map(
-    disaster_id: int, disaster_name: str, lang: str, db: AsyncSession
-) -> dict:
-    # Get the latest map for the disaster
-    map_result = await db.execute(
-        select(Report)
-        .filter(
-            Report.disaster_id == disaster_id,
-            Report.content_format_id == settings.CONTENT_FORMAT_MAP,
-        )
-        .order_by(desc(Report.date_created))
-        .limit(1)
-    )
-    latest_map = map_result.scalar_one_or_none()
-    if not latest_map:
-        raise HTTPException(status_code=404, detail="No Map found for this disaster")
-    # Extract the images from the Map PDF
-    if latest_map.extracted_maps:
-        extracted_images = latest_map.extracted_maps
-    elif (
-        latest_map.file
-        and isinstance(latest_map.file, list)
-        and len(latest_map.file) > 0
-    ):
-        pdf_url = latest_map.file[0].get("url")
-        if not pdf_url:
-            raise HTTPException(
-                status_code=404, detail="No valid PDF URL found for the latest Map"
-            )
-        extracted_images = await pdf_to_base64_pngs(pdf_url)
-        # Update the map with the extracted images
-        latest_map.extracted_maps = extracted_images
-        await db.commit()
-    else:
-        raise HTTPException(
-            status_code=404,
-            detail="No images available for analysis in the latest map",
-        )
-
-    # Perform AI analysis on the map images
-    map_analysis = await generate_map_analysis(
-        disaster_name, latest_map.title, latest_map.extracted_maps, lang
-    )
-
-    # Return the map analysis data
-    return {
-        "disaster_id": disaster_id,
-        "latest_map_title": latest_map.title,
-        "latest_map_date": latest_map.date_created.isoformat(),
-        "latest_map_url": latest_map.url,
-        "latest_map_image_url": latest_map.file[0].get("preview").get("url"),
-        "type": "map",
-        "analysis": map_analysis.model_dump(),
-    }
-
-
-async def analyze_news(
-    disaster_id: int, disaster_name: str, lang: str, db: AsyncSession
-) -> dict:
-    # Perform extraction of latest news articles related to the disaster
-    news_result = await db.execute(
-        select(Report)
-        .filter(
-            Report.disaster_id == disaster_id,
-            Report.content_format_id == settings.CONTENT_FORMAT_NEWS,
-        )
-        .order_by(desc(Report.date_created))
-        .limit(1)
+    # Analysis runs in a background worker; poll the job for its status
+    job = await enqueue_analysis_job(db, disaster_id, analysis_type, lang.value)
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder(AnalysisJob.model_validate(job)),
+        headers={"Location": f"{settings.API_V1_STR}/jobs/{job.id}"},
     )
-    latest_news = news_result.scalar_one_or_none()
-    if not latest_news:
-        raise HTTPException(status_code=404, detail="No News found for this disaster")
-
-    # Return the news analysis data
-
-    return {
-        "disaster_id": disaster_id,
-        "type": "news",
-        "latest_news_title": latest_news.title,
-        "latest_news_date": latest_news.date_created.isoformat(),
-        "latest_news_content": latest_news.body,
-        "latest_news_url": latest_news.url,
-    }
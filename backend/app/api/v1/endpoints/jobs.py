@@ -0,0 +1,16 @@
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.analysis_job import AnalysisJob as AnalysisJobModel
+from app.schemas.job import AnalysisJob
+from app.api import deps
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=AnalysisJob)
+async def read_job(job_id: int, db: AsyncSession = Depends(deps.get_db)) -> Any:
+    job = await db.get(AnalysisJobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return AnalysisJob.model_validate(job)
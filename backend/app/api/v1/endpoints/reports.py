@@ -1,53 +1,102 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import desc
+import json
+import logging
+import os
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import load_only, undefer_group
 from app.core.config import settings
+from app.db.session import AsyncSessionLocal
 from app.models.report import Report
+from app.models.report_image import ReportImage
 from app.schemas.report import ReportList, ReportDetail
 from app.api import deps
-from app.utils.pdf_extractor import extract_text_from_pdf_url, pdf_to_base64_pngs
+from app.utils.image_store import save_report_images
+from app.utils.pagination import paginate, set_next_cursor
+from app.utils.pdf_extractor import (
+    close_pdf,
+    extract_text_from_pdf_url,
+    iter_pdf_text,
+    open_pdf_url,
+    render_pdf_images,
+)
+from app.utils.report_chunking import PAGE_BREAK
+from app.utils.response_cache import cached_response, invalidate_cached_responses
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Re-renders of map reports whose stored image files are missing
+image_flight = SingleFlight()
+
+# Columns serialized by ReportList
+REPORT_LIST_COLUMNS = load_only(
+    Report.id,
+    Report.disaster_id,
+    Report.title,
+    Report.status,
+    Report.date_original,
+    Report.date_changed,
+    Report.content_format_id,
+    Report.content_format_name,
+)
+
 
 @router.get("/", response_model=List[ReportList])
 async def read_reports(
-    db: AsyncSession = Depends(deps.get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
-    result = await db.execute(
-        select(Report).order_by(desc(Report.date_changed)).offset(skip).limit(limit)
-    )
+    query = select(Report).options(REPORT_LIST_COLUMNS)
+    result = await db.execute(paginate(query, Report, skip, limit, cursor))
     reports = result.scalars().all()
+    set_next_cursor(response, reports, limit)
     return [ReportList.model_validate(report) for report in reports]
 
 
 @router.get("/{report_id}", response_model=ReportDetail)
-async def read_report(report_id: int, db: AsyncSession = Depends(deps.get_db)) -> Any:
-    result = await db.execute(select(Report).filter(Report.id == report_id))
-    report = result.scalar_one_or_none()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-    return ReportDetail.model_validate(report)
+async def read_report(
+    report_id: int, request: Request, db: AsyncSession = Depends(deps.get_db)
+) -> Any:
+    async def build(response: Response):
+        result = await db.execute(
+            select(Report)
+            .options(undefer_group("content"))
+            .filter(Report.id == report_id)
+        )
+        report = result.scalar_one_or_none()
+        if not report:
+            raise HTTPException(status_code=404, detail="Report not found")
+        return ReportDetail.model_validate(report)
+
+    return await cached_response(request, build)
 
 
 @router.get("/disaster/{disaster_id}", response_model=List[ReportList])
 async def read_reports_by_disaster(
     disaster_id: int,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     query = (
         select(Report)
+        .options(REPORT_LIST_COLUMNS)
         .filter(Report.disaster_id == disaster_id)
-        .order_by(desc(Report.date_changed))
-        .offset(skip)
-        .limit(limit)
     )
-    result = await db.execute(query)
+    result = await db.execute(paginate(query, Report, skip, limit, cursor))
     reports = result.scalars().all()
+    set_next_cursor(response, reports, limit)
     return [ReportList.model_validate(report) for report in reports]
 
 
@@ -74,10 +123,73 @@ async def extract_report_pdf(
 
     report.extracted_report = extracted_text
     await db.commit()
+    await invalidate_cached_responses()
 
     return {"text": extracted_text}
 
 
+@router.get("/{report_id}/text/stream")
+async def stream_report_pdf(
+    report_id: int, db: AsyncSession = Depends(deps.get_db)
+) -> StreamingResponse:
+    """
+    Stream the text of a PDF report as NDJSON, one ``{"page", "text"}`` line
+    per page as it is extracted, then a ``{"done", "pages"}`` line once the
+    full text has been saved to the report. A failure after streaming has
+    started is reported as an ``{"error"}`` line.
+    """
+    result = await db.execute(
+        select(Report)
+        .options(load_only(Report.id, Report.file))
+        .filter(Report.id == report_id)
+    )
+    report = result.scalar_one_or_none()
+
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    if not report.file or not isinstance(report.file, list) or len(report.file) == 0:
+        raise HTTPException(status_code=404, detail="No PDF file found for this report")
+
+    pdf_url = report.file[0].get("url")
+    if not pdf_url:
+        raise HTTPException(
+            status_code=404, detail="No valid PDF URL found for this report"
+        )
+
+    # End the read transaction; the request's session stays open until the
+    # response is sent
+    await db.commit()
+
+    # Download the PDF before streaming so that failures get a status code
+    pdf_path, page_count = await open_pdf_url(pdf_url)
+
+    async def lines():
+        pages = []
+        try:
+            async for text in iter_pdf_text(pdf_path, page_count):
+                pages.append(text)
+                yield json.dumps({"page": len(pages), "text": text}) + "\n"
+        except Exception as e:
+            logger.exception(f"Failed to extract text from report {report_id}")
+            yield json.dumps({"error": f"An error occurred: {e}"}) + "\n"
+            return
+        finally:
+            close_pdf(pdf_path)
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Report)
+                .where(Report.id == report_id)
+                .values(extracted_report=PAGE_BREAK.join(pages))
+            )
+            await session.commit()
+        await invalidate_cached_responses()
+        yield json.dumps({"done": True, "pages": len(pages)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{report_id}/maps", response_model=dict)
 async def extract_report_images(
     report_id: int, db: AsyncSession = Depends(deps.get_db)
@@ -103,9 +215,60 @@ async def extract_report_images(
             status_code=404, detail="No valid PDF URL found for this report"
         )
 
-    base64_pngs = await pdf_to_base64_pngs(pdf_url)
+    rendered_images = await render_pdf_images(pdf_url)
 
-    report.extracted_maps = base64_pngs
+    image_references = await save_report_images(db, report, rendered_images)
     await db.commit()
+    await invalidate_cached_responses()
+
+    return {"images": image_references}
+
+
+async def regenerate_report_images(report_id: int):
+    """
+    Render a map report again and store its images, e.g. after the image
+    directory was lost. Runs in its own session so that it can be shared by
+    concurrent requests.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Report).filter(
+                Report.id == report_id,
+                Report.content_format_id == settings.CONTENT_FORMAT_MAP,
+            )
+        )
+        report = result.scalar_one_or_none()
+        if not report or not report.file or not isinstance(report.file, list):
+            return
+        pdf_url = report.file[0].get("url")
+        if not pdf_url:
+            return
 
-    return {"images": base64_pngs}
+        logger.warning(f"Images of report {report_id} are missing, rendering again")
+        rendered_images = await render_pdf_images(pdf_url)
+        await save_report_images(db, report, rendered_images)
+        await db.commit()
+    await invalidate_cached_responses()
+
+
+@router.get("/{report_id}/maps/{page}")
+async def read_report_image(
+    report_id: int, page: int, db: AsyncSession = Depends(deps.get_db)
+) -> FileResponse:
+    query = (
+        select(ReportImage)
+        .filter(ReportImage.report_id == report_id, ReportImage.page == page)
+        .execution_options(populate_existing=True)
+    )
+    image = (await db.execute(query)).scalar_one_or_none()
+    if image and not os.path.exists(image.path):
+        await image_flight.do(report_id, lambda: regenerate_report_images(report_id))
+        image = (await db.execute(query)).scalar_one_or_none()
+    if not image or not os.path.exists(image.path):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return FileResponse(
+        image.path,
+        media_type=image.media_type,
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
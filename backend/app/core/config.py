@@ -1,4 +1,5 @@
 # app/core/config.py
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -11,9 +12,36 @@ class Settings(BaseSettings):
     CONTENT_FORMAT_MAP: int = 12
     CONTENT_FORMAT_NEWS: int = 8
     DATABASE_URL: str
-    ANTHROPIC_API_KEY: str
+    ANTHROPIC_API_KEY: Optional[str] = None
+    LLM_BACKEND: Literal["anthropic", "stub"] = "anthropic"
+    LLM_MODEL: str = "claude-3-5-sonnet-20240620"
+    LLM_STUB_LATENCY_SECONDS: float = 1.0
     RELIEF_WEB_API_URL: str = "https://api.reliefweb.int/v1"
     RETENTION_PERIOD_DAYS: int = 30
+    PDF_CACHE_DIR: str = "/var/lib/disasterpulse/pdf-cache"
+    PDF_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    PDF_CACHE_TTL_SECONDS: int = 3600
+    PDF_WORKERS: Optional[int] = None
+    MAP_RENDER_SIZING: Literal["fit", "dpi"] = "fit"
+    MAP_TILE_GRID: int = 1
+    MAP_IMAGE_FORMAT: Literal["png", "webp"] = "png"
+    MAP_DUPLICATE_DISTANCE: int = 8
+    MAP_PAGE_CONCURRENCY: int = 4
+    IMAGE_STORE_DIR: str = "/var/lib/disasterpulse/images"
+    IMAGE_PRUNE_MIN_AGE_SECONDS: int = 3600
+    REPORT_CHUNK_TOKENS: int = 30000
+    REPORT_CHUNK_CONCURRENCY: int = 4
+    REPORT_MAX_CHUNKS: int = 12
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    RESPONSE_CACHE_MAX_AGE_SECONDS: int = 60
+    SYNC_NOTIFY_CHANNEL: str = "disasterpulse_sync"
+    CACHE_NOTIFY_CHANNEL: str = "disasterpulse_cache"
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_TIMEOUT_SECONDS: float = 600.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 30.0
 
     class Config:
         env_file = ".env"
@@ -3,3 +3,10 @@
 from app.db.base_class import Base
 from app.models.disaster import Disaster
 from app.models.report import Report
+from app.models.report_image import ReportImage
+from app.models.sync_state import SyncState
+from app.models.analysis_job import AnalysisJob
+from app.models.analysis import Analysis
+from app.models.map_page_description import MapPageDescription
+from app.models.sync_run import SyncRun
+from app.models.work_claim import WorkClaim
@@ -4,16 +4,23 @@ from fastapi import FastAPI
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.db.session import engine
-from app.db.base import Base
+from app.utils.job_queue import start_job_workers, stop_job_workers
+from app.utils.pdf_cache import pdf_cache
+from app.utils.pdf_extractor import shutdown_pdf_executor
+from app.utils.sync_listener import start_sync_listener, stop_sync_listener
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup: the schema is managed by Alembic (`alembic upgrade head`)
+    start_job_workers()
+    start_sync_listener()
     yield
     # Shutdown
+    await stop_sync_listener()
+    await stop_job_workers()
+    await pdf_cache.close()
+    shutdown_pdf_executor()
     await engine.dispose()
 
 
@@ -0,0 +1,37 @@
+# app/models/analysis.py
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    JSON,
+    String,
+    UniqueConstraint,
+    func,
+)
+from app.db.base_class import Base
+
+
+class Analysis(Base):
+    """An analysis result per disaster, type, language and source report."""
+
+    id = Column(Integer, primary_key=True, index=True)
+    disaster_id = Column(
+        Integer, ForeignKey("disaster.id", ondelete="CASCADE"), nullable=False
+    )
+    analysis_type = Column(String, nullable=False)
+    lang = Column(String, nullable=False)
+    source_report_id = Column(
+        Integer, ForeignKey("report.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    result = Column(JSON, nullable=False)
+    # Model calls, token counts and latency spent computing the result
+    usage = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("disaster_id", "analysis_type", "lang", "source_report_id"),
+    )
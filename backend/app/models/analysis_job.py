@@ -0,0 +1,48 @@
+# app/models/analysis_job.py
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
+from app.db.base_class import Base
+
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+class AnalysisJob(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    disaster_id = Column(
+        Integer, ForeignKey("disaster.id", ondelete="CASCADE"), nullable=False
+    )
+    analysis_type = Column(String, nullable=False)
+    lang = Column(String, nullable=False)
+    # queued -> running -> succeeded | failed
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    # Requeued jobs are not claimed again before then
+    available_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index("ix_analysisjob_status_created_at", "status", "created_at"),
+        # At most one active job per disaster, analysis type and language
+        Index(
+            "ix_analysisjob_active",
+            "disaster_id",
+            "analysis_type",
+            "lang",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -12,13 +12,14 @@ class Disaster(Base):
     url = Column(String)
     url_alias = Column(String)
     date_created = Column(DateTime(timezone=True))
-    date_changed = Column(DateTime(timezone=True))
+    date_changed = Column(DateTime(timezone=True), nullable=False)
     date_event = Column(DateTime(timezone=True), index=True)
 
     primary_country = Column(JSON)
     affected_countries = Column(JSON)
     primary_type = Column(JSON)
     related_glide = Column(JSON)
+    content_hash = Column(String(64))
 
     # AI Fields
     report_analysis = Column(JSON)
@@ -26,3 +27,6 @@ class Disaster(Base):
     news_analysis = Column(JSON)
 
     reports = relationship("Report", back_populates="disaster")
+
+    # Keyset pagination of the listing endpoints
+    __table_args__ = (Index("ix_disaster_date_changed_id", "date_changed", "id"),)
@@ -0,0 +1,20 @@
+# app/models/disaster_summary.py
+from sqlalchemy import BigInteger, DateTime, Integer, JSON, String, column, table
+
+# The disaster_summary view, created by migration 0007. It is not part of
+# the ORM metadata so that Alembic does not manage it as a table.
+disaster_summary = table(
+    "disaster_summary",
+    column("id", Integer),
+    column("name", String),
+    column("status", String),
+    column("date_event", DateTime(timezone=True)),
+    column("date_changed", DateTime(timezone=True)),
+    column("primary_country", JSON),
+    column("primary_type", JSON),
+    column("situation_report_count", Integer),
+    column("map_count", Integer),
+    column("news_count", Integer),
+    column("latest_report_date", DateTime(timezone=True)),
+    column("affected_people", BigInteger),
+)
@@ -0,0 +1,15 @@
+# app/models/map_page_description.py
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint, func
+from app.db.base_class import Base
+
+
+class MapPageDescription(Base):
+    """A model's description of one rendered map page, keyed by its content."""
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False)
+    model = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (UniqueConstraint("sha256", "model"),)
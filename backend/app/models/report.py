@@ -1,6 +1,15 @@
 # app/models/report.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+)
+from sqlalchemy.orm import deferred, relationship
 from app.db.base_class import Base
 
 
@@ -8,13 +17,15 @@ class Report(Base):
     id = Column(Integer, primary_key=True, index=True)
     disaster_id = Column(Integer, ForeignKey("disaster.id"), index=True)
     title = Column(String, index=True)
-    body = Column(String)
+    # Heavy content is only loaded when a query asks for it with
+    # undefer_group("content").
+    body = deferred(Column(String), group="content", raiseload=True)
     url = Column(String)
     url_alias = Column(String)
     status = Column(String, index=True)
 
     date_created = Column(DateTime(timezone=True), index=True)
-    date_changed = Column(DateTime(timezone=True))
+    date_changed = Column(DateTime(timezone=True), nullable=False)
     date_original = Column(DateTime(timezone=True))
     primary_country = Column(JSON)
     affected_countries = Column(JSON)
@@ -22,10 +33,32 @@ class Report(Base):
     source = Column(JSON)
     theme = Column(JSON)
     file = Column(JSON)
-    extracted_report = Column(Text)
-    extracted_maps = Column(JSON)
+    content_hash = Column(String(64))
+    extracted_report = deferred(Column(Text), group="content", raiseload=True)
+    extracted_maps = deferred(Column(JSON), group="content", raiseload=True)
 
     content_format_id = Column(Integer, index=True)
     content_format_name = Column(String, index=True)
 
     disaster = relationship("Disaster", back_populates="reports")
+    images = relationship(
+        "ReportImage",
+        back_populates="report",
+        order_by="ReportImage.page",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # Latest report of a format for a disaster (analysis endpoints)
+        Index(
+            "ix_report_disaster_id_content_format_id_date_created",
+            "disaster_id",
+            "content_format_id",
+            "date_created",
+        ),
+        # Keyset pagination of the listing endpoints
+        Index("ix_report_date_changed_id", "date_changed", "id"),
+        Index(
+            "ix_report_disaster_id_date_changed_id", "disaster_id", "date_changed", "id"
+        ),
+    )
@@ -0,0 +1,32 @@
+# app/models/report_image.py
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+
+class ReportImage(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    report_id = Column(
+        Integer, ForeignKey("report.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    page = Column(Integer, nullable=False)
+    media_type = Column(String, nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+    size = Column(Integer)
+    sha256 = Column(String(64))
+    phash = Column(String(64))
+    path = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    report = relationship("Report", back_populates="images")
+
+    __table_args__ = (UniqueConstraint("report_id", "page"),)
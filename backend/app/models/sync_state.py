@@ -0,0 +1,10 @@
+# app/models/sync_state.py
+from sqlalchemy import Column, String, DateTime
+from app.db.base_class import Base
+
+
+class SyncState(Base):
+    """Incremental sync watermarks, written by the datasync service."""
+
+    key = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True))
@@ -0,0 +1,10 @@
+# app/models/work_claim.py
+from sqlalchemy import Column, DateTime, String
+from app.db.base_class import Base
+
+
+class WorkClaim(Base):
+    """Work in progress, claimed by the process computing it."""
+
+    key = Column(String, primary_key=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=False)
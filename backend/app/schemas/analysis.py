@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class Analysis(BaseModel):
+    disaster_id: int
+    analysis_type: str
+    lang: str
+    source_report_id: int
+    result: dict
+    usage: Optional[dict] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
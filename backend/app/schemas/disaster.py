@@ -29,6 +29,22 @@ class DisasterList(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class DisasterSummary(BaseModel):
+    id: int
+    name: str
+    status: str
+    date_event: datetime
+    date_changed: datetime
+    primary_country: Optional[dict] = None
+    primary_type: Optional[dict] = None
+    situation_report_count: int
+    map_count: int
+    news_count: int
+    latest_report_date: Optional[datetime] = None
+    affected_people: Optional[int] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
 class DisasterDetail(DisasterBase):
     description: Optional[str] = None
     date_created: datetime
@@ -0,0 +1,52 @@
+# app/tests/conftest.py
+import os
+import tempfile
+
+# Settings are read at import time, so point them at throwaway locations
+# before any app module is imported.
+_tmp = tempfile.mkdtemp(prefix="disasterpulse-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/tests.db")
+os.environ.setdefault("ANTHROPIC_API_KEY", "unused")
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_SECONDS", "0")
+os.environ.setdefault("PDF_CACHE_DIR", f"{_tmp}/pdf-cache")
+os.environ.setdefault("IMAGE_STORE_DIR", f"{_tmp}/images")
+os.environ.setdefault("PDF_WORKERS", "2")
+
+import pytest
+
+# Register every model, as importing the API does in the app
+import app.db.base  # noqa: F401
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def migrated():
+    """Bring the test database to the latest migration once per run."""
+    from pathlib import Path
+    from alembic import command
+    from alembic.config import Config
+
+    backend_dir = Path(__file__).resolve().parents[2]
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "migrations"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+async def db(migrated):
+    """A session on the migrated test database, emptied after each test."""
+    from app.db.base import Base
+    from app.db.session import AsyncSessionLocal, engine
+
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+    # Each test runs in its own event loop
+    await engine.dispose()
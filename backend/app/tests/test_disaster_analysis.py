@@ -0,0 +1,45 @@
+# app/tests/test_disaster_analysis.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.analysis import Analysis
+from app.models.disaster import Disaster
+from app.models.report import Report
+from app.utils.disaster_analysis import get_or_compute_analysis
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_disaster_column_is_not_read_as_the_analysis(db):
+    # A copy left over from an earlier report, that sync failed to clear
+    db.add(
+        Disaster(
+            id=1,
+            name="Flood",
+            date_changed=datetime(2024, 7, 1),
+            report_analysis={"latest_report_id": 1, "analysis": {}},
+        )
+    )
+    db.add(
+        Report(
+            id=2,
+            disaster_id=1,
+            title="Situation Report 2",
+            date_created=datetime(2024, 7, 1),
+            date_changed=datetime(2024, 7, 1),
+            content_format_id=settings.CONTENT_FORMAT_SITUATION_REPORT,
+            extracted_report="Flooding continues in the region.",
+        )
+    )
+    await db.commit()
+
+    result = await get_or_compute_analysis(1, "report", "en")
+
+    assert result["latest_report_id"] == 2
+    analysis = (await db.execute(select(Analysis))).scalar_one()
+    assert analysis.source_report_id == 2
+    db.expire_all()
+    assert (await db.get(Disaster, 1)).report_analysis == result
@@ -0,0 +1,63 @@
+# app/tests/test_image_hash.py
+import io
+
+from PIL import Image, ImageDraw
+
+from app.core.config import settings
+from app.utils.image_hash import (
+    HASH_SIZE,
+    dhash,
+    drop_near_duplicates,
+    hamming_distance,
+)
+
+
+def map_page(shift: int = 0, flood: bool = True) -> Image.Image:
+    img = Image.new("RGB", (800, 600), "white")
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((50, 50, 750, 550), outline="black", width=4)
+    draw.line((50, 300, 750, 300 + shift), fill="gray", width=6)
+    if flood:
+        draw.ellipse((200 + shift, 150, 500 + shift, 420), fill="blue")
+    return img
+
+
+def reencoded(img: Image.Image) -> Image.Image:
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=60)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+def test_dhash_is_a_fixed_width_hex_string():
+    value = dhash(map_page())
+    assert len(value) == HASH_SIZE**2 // 4
+    int(value, 16)
+
+
+def test_reencoded_page_hashes_within_the_duplicate_distance():
+    page = map_page()
+    distance = hamming_distance(dhash(page), dhash(reencoded(page)))
+    assert distance <= settings.MAP_DUPLICATE_DISTANCE
+
+
+def test_different_pages_hash_apart():
+    distance = hamming_distance(dhash(map_page()), dhash(map_page(flood=False)))
+    assert distance > settings.MAP_DUPLICATE_DISTANCE
+
+
+def test_hamming_distance():
+    assert hamming_distance("0f", "0f") == 0
+    assert hamming_distance("0f", "f0") == 8
+    assert hamming_distance("01", "03") == 1
+
+
+def test_drop_near_duplicates_keeps_the_first_of_each_group_in_order():
+    pages = ["a", "b", "a2", "c", "none"]
+    hashes = ["00ff", "ff00", "00fe", "0f0f", ""]
+
+    assert drop_near_duplicates(pages, hashes, 2) == ["a", "b", "c", "none"]
+    assert drop_near_duplicates(pages, hashes, 0) == pages
+
+
+def test_items_without_a_hash_are_never_dropped():
+    assert drop_near_duplicates(["x", "y"], ["", ""], 256) == ["x", "y"]
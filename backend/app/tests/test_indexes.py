@@ -0,0 +1,90 @@
+# app/tests/test_indexes.py
+"""
+Check that the hot queries are answered from the composite indexes created
+by the migrations, by running them through EXPLAIN QUERY PLAN on the
+migrated SQLite test database. A plan that scans a table or sorts in a temp
+B-tree means an index no longer matches its query.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event
+from sqlalchemy.future import select
+
+from app.api.v1.endpoints import reports
+from app.api.v1.endpoints.disasters import DISASTER_LIST_COLUMNS
+from app.db.session import engine
+from app.models.disaster import Disaster
+from app.utils.disaster_analysis import get_latest_source_report
+from app.utils.pagination import encode_cursor, paginate
+
+pytestmark = pytest.mark.anyio
+
+CURSOR = encode_cursor(datetime(2024, 7, 1), 100)
+
+
+@contextmanager
+def captured_selects():
+    """Collect the SELECT statements sent to the database, with parameters."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def query_plans(db, statements):
+    connection = await db.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        plans.append(" | ".join(row[-1] for row in result))
+    return plans
+
+
+def assert_uses_index(plan: str, index: str):
+    assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+async def test_latest_source_report_uses_its_index(db):
+    with captured_selects() as statements:
+        with pytest.raises(HTTPException):
+            await get_latest_source_report(db, 1, "report")
+    (plan,) = await query_plans(db, statements)
+    assert_uses_index(plan, "ix_report_disaster_id_content_format_id_date_created")
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+async def test_report_listing_uses_keyset_index(db, cursor):
+    with captured_selects() as statements:
+        await reports.read_reports(Response(), db, 0, 100, cursor)
+    (plan,) = await query_plans(db, statements)
+    assert_uses_index(plan, "ix_report_date_changed_id")
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+async def test_disaster_report_listing_uses_keyset_index(db, cursor):
+    with captured_selects() as statements:
+        await reports.read_reports_by_disaster(1, Response(), db, 0, 100, cursor)
+    (plan,) = await query_plans(db, statements)
+    assert_uses_index(plan, "ix_report_disaster_id_date_changed_id")
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+async def test_disaster_listing_uses_keyset_index(db, cursor):
+    query = select(Disaster).options(DISASTER_LIST_COLUMNS)
+    with captured_selects() as statements:
+        await db.execute(paginate(query, Disaster, 0, 100, cursor))
+    (plan,) = await query_plans(db, statements)
+    assert_uses_index(plan, "ix_disaster_date_changed_id")
@@ -0,0 +1,120 @@
+# app/tests/test_job_queue.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.analysis_job import AnalysisJob
+from app.models.disaster import Disaster
+from app.utils import job_queue
+from app.utils.job_queue import claim_job, enqueue_analysis_job, process_job
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def disaster(db):
+    db.add(Disaster(id=1, name="Flood", date_changed=datetime(2024, 7, 1)))
+    await db.commit()
+    return 1
+
+
+async def job_status(db, job_id):
+    db.expire_all()
+    job = await db.get(AnalysisJob, job_id)
+    return job.status, job.attempts
+
+
+async def test_enqueue_returns_the_active_job(db, disaster):
+    first = await enqueue_analysis_job(db, disaster, "report", "en")
+    second = await enqueue_analysis_job(db, disaster, "report", "en")
+    other = await enqueue_analysis_job(db, disaster, "report", "fr")
+    assert first.id == second.id != other.id
+
+
+async def test_concurrent_workers_claim_a_job_once(db, disaster):
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+
+    claims = await asyncio.gather(*(claim_job() for _ in range(4)))
+
+    assert [claimed.id for claimed in claims if claimed] == [job.id]
+    assert await job_status(db, job.id) == ("running", 1)
+    assert await claim_job() is None
+
+
+async def test_stale_running_job_is_claimed_again(db, disaster):
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+    await claim_job()
+    stale = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.JOB_TIMEOUT_SECONDS + 120
+    )
+    (await db.get(AnalysisJob, job.id)).started_at = stale
+    await db.commit()
+
+    reclaimed = await claim_job()
+
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+
+
+async def test_failed_job_is_retried_until_max_attempts(db, disaster, monkeypatch):
+    async def failing_analysis(*args):
+        raise RuntimeError("model overloaded")
+
+    monkeypatch.setattr(job_queue, "get_or_compute_analysis", failing_analysis)
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+
+    for attempt in range(1, settings.JOB_MAX_ATTEMPTS + 1):
+        claimed = await claim_job()
+        assert claimed.attempts == attempt
+        await process_job(claimed)
+
+    status, attempts = await job_status(db, job.id)
+    assert (status, attempts) == ("failed", settings.JOB_MAX_ATTEMPTS)
+    assert await claim_job() is None
+
+
+async def test_timed_out_job_backs_off_before_retrying(db, disaster, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_analysis(*args):
+        await release.wait()
+
+    monkeypatch.setattr(job_queue, "get_or_compute_analysis", slow_analysis)
+    monkeypatch.setattr(settings, "JOB_TIMEOUT_SECONDS", 0.01)
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+    await process_job(await claim_job())
+
+    assert await job_status(db, job.id) == ("queued", 1)
+    assert await claim_job() is None
+
+    (await db.get(AnalysisJob, job.id)).available_at = datetime.now(timezone.utc)
+    await db.commit()
+    assert (await claim_job()).attempts == 2
+
+
+async def test_missing_source_fails_without_retry(db, disaster, monkeypatch):
+    async def missing_report(*args):
+        raise HTTPException(status_code=404, detail="No situation report found")
+
+    monkeypatch.setattr(job_queue, "get_or_compute_analysis", missing_report)
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+    await process_job(await claim_job())
+
+    assert await job_status(db, job.id) == ("failed", 1)
+    result = await db.execute(select(AnalysisJob.error))
+    assert result.scalar_one() == "No situation report found"
+
+
+async def test_successful_job_is_marked_succeeded(db, disaster, monkeypatch):
+    async def analysis(*args):
+        return {"summary": "ok"}
+
+    monkeypatch.setattr(job_queue, "get_or_compute_analysis", analysis)
+    job = await enqueue_analysis_job(db, disaster, "report", "en")
+    await process_job(await claim_job())
+
+    assert await job_status(db, job.id) == ("succeeded", 1)
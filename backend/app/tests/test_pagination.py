@@ -0,0 +1,61 @@
+# app/tests/test_pagination.py
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.future import select
+
+from app.models.disaster import Disaster
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    set_next_cursor,
+)
+
+
+def test_cursor_round_trip():
+    date_changed = datetime(2024, 7, 1, 12, 30)
+    cursor = encode_cursor(date_changed, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (date_changed, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        base64.urlsafe_b64encode(b'{"id": 1}').decode(),
+        base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+    ],
+)
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_cursor_pages_cover_every_row_once(db):
+    start = datetime(2024, 7, 1)
+    # Pairs of rows share a change date, so pages must break ties on id
+    db.add_all(
+        Disaster(id=disaster_id, date_changed=start + timedelta(hours=disaster_id // 2))
+        for disaster_id in range(1, 12)
+    )
+    await db.commit()
+
+    seen, cursor = [], None
+    while True:
+        query = paginate(select(Disaster), Disaster, 0, 3, cursor)
+        rows = (await db.execute(query)).scalars().all()
+        seen.extend(row.id for row in rows)
+        response = Response()
+        set_next_cursor(response, rows, 3)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert seen == sorted(range(1, 12), key=lambda i: (i // 2, i), reverse=True)
@@ -0,0 +1,65 @@
+# app/tests/test_pdf_cache.py
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils.pdf_cache import PDFCache
+
+pytestmark = pytest.mark.anyio
+
+PDFS = {
+    "https://reliefweb.int/a.pdf": b"%PDF-a" + b"a" * 1000,
+    "https://reliefweb.int/b.pdf": b"%PDF-b" + b"b" * 1000,
+}
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=PDFS[str(request.url)])
+
+    # Room for one PDF only
+    cache = PDFCache(str(tmp_path), max_bytes=1500, ttl_seconds=3600)
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache.requests = requests
+    yield cache
+    await cache.close()
+
+
+async def test_concurrent_requests_share_one_download(cache):
+    url = "https://reliefweb.int/a.pdf"
+    paths = await asyncio.gather(*(cache.get_path(url) for _ in range(5)))
+
+    assert cache.requests == [url]
+    assert len(set(paths)) == 1
+
+
+async def test_leased_blob_is_not_evicted(cache):
+    url_a, url_b = PDFS
+    async with cache.leased(url_a) as lease_path:
+        blob_a = await cache.get_path(url_a)
+        await cache.get_path(url_b)
+
+        assert blob_a.exists()
+        assert lease_path.read_bytes() == PDFS[url_a]
+
+    # Without the lease it is the first to go
+    cache._evict(keep=await cache.get_path(url_b))
+    assert not blob_a.exists()
+
+
+async def test_lease_stays_readable_when_the_blob_is_removed(cache):
+    url = "https://reliefweb.int/a.pdf"
+    async with cache.leased(url) as lease_path:
+        # As another process evicting it would
+        (await cache.get_path(url)).unlink()
+        assert lease_path.read_bytes() == PDFS[url]
+    assert not lease_path.exists()
+
+    assert await cache.get(url) == PDFS[url]
+    assert cache.requests == [url, url]
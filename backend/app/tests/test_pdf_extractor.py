@@ -0,0 +1,49 @@
+# app/tests/test_pdf_extractor.py
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.utils import pdf_extractor
+from app.utils.pdf_extractor import _page_count, _run_in_pool, iter_pdf_text
+
+pytestmark = pytest.mark.anyio
+
+
+def crash_once(marker: str) -> str:
+    # Runs in a worker: the first call kills the process, later ones succeed.
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "report.pdf"
+    doc = fitz.open()
+    for page_num in range(6):
+        doc.new_page().insert_text((72, 72), f"Page {page_num}")
+    doc.save(path)
+    doc.close()
+    yield str(path)
+    pdf_extractor.shutdown_pdf_executor()
+
+
+async def test_worker_crash_replaces_the_pool_and_retries(pdf_path, tmp_path):
+    broken = pdf_extractor.get_pdf_executor()
+    assert await _run_in_pool(crash_once, str(tmp_path / "crashed")) == "recovered"
+    assert pdf_extractor.get_pdf_executor() is not broken
+    assert await _run_in_pool(_page_count, pdf_path) == 6
+
+
+async def test_repeated_crash_is_raised_and_the_pool_stays_usable(pdf_path):
+    with pytest.raises(BrokenProcessPool):
+        await _run_in_pool(os._exit, 1)
+    assert await _run_in_pool(_page_count, pdf_path) == 6
+
+
+async def test_iter_pdf_text_yields_pages_in_order(pdf_path):
+    pages = [text async for text in iter_pdf_text(pdf_path, 6)]
+    assert [text.strip() for text in pages] == [f"Page {n}" for n in range(6)]
@@ -0,0 +1,161 @@
+# app/tests/test_report_chunking.py
+import json
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.utils.ai_analysis import DisasterAnalysis, generate_report_analysis
+from app.utils.fake_llm import FakeLLMClient
+from app.utils.report_chunking import (
+    PAGE_BREAK,
+    TABLE_MIN_LINES,
+    clean_text,
+    estimate_tokens,
+    split_into_chunks,
+)
+
+HEADER = "Flood Response - Situation Report No. 5"
+
+EVENTS = [
+    ("2024-07-02", "Heavy rains begin over the northern provinces"),
+    ("2024-07-05", "River Kaya bursts its banks near Dori"),
+    ("2024-07-09", "Government declares a state of emergency"),
+    ("2024-07-14", "Second wave of flooding reaches the capital"),
+]
+
+
+def report_pages():
+    # Key figures and dates on lines of their own, as extracted from
+    # infographic layouts, plus a funding table of bare figures
+    pages = []
+    for number, (date, event) in enumerate(EVENTS, 1):
+        lines = [HEADER, "Key developments", date, event]
+        if number == 2:
+            lines += ["People affected", "4.1M", "Houses destroyed", "1,250,000"]
+        if number == 3:
+            lines += ["Funding by cluster (USD)"]
+            lines += [f"{n},500,000" for n in range(1, TABLE_MIN_LINES + 2)]
+        lines += [f"Needs remain high in the {number} districts visited. " * 20]
+        lines += [f"Page {number} of {len(EVENTS)}"]
+        pages.append("\n".join(lines))
+    return pages
+
+
+class ReadingLLMClient(FakeLLMClient):
+    """
+    A fake that answers from the prompt: it reads the people affected and
+    the dated events from report text, and merges them from partial analyses
+    given as JSON, the way a model would.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    async def create_with_completion(
+        self, model, messages, max_tokens, response_model, **kwargs
+    ):
+        _, completion = await super().create_with_completion(
+            model, messages, max_tokens, response_model, **kwargs
+        )
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+
+        parts = [
+            json.loads(part) for part in re.findall(r"^Part \d+: (.+)$", prompt, re.M)
+        ]
+        if parts:
+            affected = [p["impact_analysis"]["affected_people"] for p in parts]
+            events = [e for p in parts for e in p["timeline"]["events"]]
+            affected_people = max((a for a in affected if a), default=None)
+        else:
+            figure = re.search(r"People affected\n([\d.,]+)(M?)", prompt)
+            affected_people = None
+            if figure:
+                value = float(figure.group(1).replace(",", ""))
+                affected_people = round(value * (1_000_000 if figure.group(2) else 1))
+            events = [
+                {"date": date, "description": event}
+                for date, event in re.findall(
+                    r"\b(\d{4}-\d{2}-\d{2})\n(.+)", prompt, re.M
+                )
+            ]
+
+        analysis = DisasterAnalysis(
+            executive_summary="Flooding in the north",
+            timeline={"events": sorted(events, key=lambda e: e["date"])},
+            impact_analysis={
+                "affected_people": affected_people,
+                "economic_impact": "",
+                "infrastructure_damage": "",
+            },
+            needs_analysis={
+                "immediate_needs": [],
+                "long_term_needs": [],
+                "resource_gaps": [],
+            },
+        )
+        return analysis, completion
+
+
+def test_clean_text_keeps_key_figures_and_drops_boilerplate():
+    cleaned = clean_text(PAGE_BREAK.join(report_pages()))
+
+    assert HEADER not in cleaned
+    for line in ("4.1M", "1,250,000", "2024-07-02", "2024-07-14", "Page 1 of 4"):
+        assert line in cleaned.splitlines()
+    assert "1,500,000" not in cleaned
+
+
+def test_clean_text_drops_annexes_in_the_second_half():
+    pages = ["Overview", "Response", "Gaps", "ANNEX 1: Contacts\nJohn Doe"]
+    assert "Contacts" not in clean_text(PAGE_BREAK.join(pages))
+
+
+def test_split_into_chunks_packs_whole_pages_within_the_budget():
+    pages = report_pages()
+    budget = estimate_tokens(pages[0] + pages[1]) + 10
+
+    chunks = split_into_chunks(PAGE_BREAK.join(pages), budget)
+
+    assert len(chunks) < len(pages)
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    assert chunks[0] == "\n".join(pages[:2])
+
+
+def test_oversized_page_is_split_at_paragraphs():
+    page = "\n\n".join(["A paragraph of the report. " * 10] * 6)
+    chunks = split_into_chunks(page, 100)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+
+
+@pytest.mark.anyio
+async def test_chunked_and_unchunked_analyses_agree(monkeypatch):
+    report = PAGE_BREAK.join(report_pages())
+
+    whole = ReadingLLMClient()
+    unchunked = await generate_report_analysis(
+        "Floods", "Sitrep 5", report, "en", whole
+    )
+
+    monkeypatch.setattr(settings, "REPORT_CHUNK_TOKENS", estimate_tokens(report) // 3)
+    parts = ReadingLLMClient()
+    chunked = await generate_report_analysis("Floods", "Sitrep 5", report, "en", parts)
+
+    assert len(whole.prompts) == 1
+    assert len(parts.prompts) > 2
+    assert chunked.impact_analysis.affected_people == 4_100_000
+    assert chunked.model_dump() == unchunked.model_dump()
+
+
+@pytest.mark.anyio
+async def test_report_within_budget_is_sent_uncleaned():
+    client = ReadingLLMClient()
+    report = PAGE_BREAK.join(report_pages())
+
+    await generate_report_analysis("Floods", "Sitrep 5", report, "en", client)
+
+    (prompt,) = client.prompts
+    assert HEADER in prompt and "1,500,000" in prompt
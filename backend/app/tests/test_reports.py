@@ -0,0 +1,52 @@
+# app/tests/test_reports.py
+import os
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import reports
+from app.core.config import settings
+from app.models.report import Report
+from app.utils.image_store import image_store, save_report_images
+from app.utils.pdf_extractor import RenderedImage
+
+pytestmark = pytest.mark.anyio
+
+PNG = RenderedImage(b"\x89PNG\r\n\x1a\nfake", "image/png", 1, 1, "0" * 64)
+
+
+@pytest.fixture
+async def map_report(db):
+    report = Report(
+        id=1,
+        date_changed=datetime(2024, 7, 1),
+        content_format_id=settings.CONTENT_FORMAT_MAP,
+        file=[{"url": "https://reliefweb.test/map.pdf"}],
+    )
+    db.add(report)
+    await save_report_images(db, report, [PNG, PNG])
+    await db.commit()
+    return report
+
+
+async def test_missing_image_file_is_rendered_again(db, map_report, monkeypatch):
+    renders = []
+
+    async def render_pdf_images(url):
+        renders.append(url)
+        return [PNG, PNG]
+
+    monkeypatch.setattr(reports, "render_pdf_images", render_pdf_images)
+    image_store.delete_report(map_report.id)
+
+    response = await reports.read_report_image(map_report.id, 1, db)
+
+    assert os.path.exists(response.path)
+    assert renders == ["https://reliefweb.test/map.pdf"]
+
+
+async def test_unknown_page_is_not_found(db, map_report):
+    with pytest.raises(HTTPException) as error:
+        await reports.read_report_image(map_report.id, 5, db)
+    assert error.value.status_code == 404
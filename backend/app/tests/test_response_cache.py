@@ -0,0 +1,33 @@
+# app/tests/test_response_cache.py
+import pytest
+
+from app.utils.response_cache import (
+    PROCESS_TOKEN,
+    CachedResponse,
+    handle_cache_notification,
+    invalidate_cached_responses,
+    response_cache,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def cache_entry():
+    response_cache.set(
+        "key", CachedResponse(b"{}", '"etag"', {}), response_cache.generation
+    )
+
+
+async def test_invalidation_empties_the_local_cache():
+    cache_entry()
+    await invalidate_cached_responses()
+    assert response_cache.get("key") is None
+
+
+async def test_invalidations_of_other_processes_empty_the_cache():
+    cache_entry()
+    handle_cache_notification(PROCESS_TOKEN)
+    assert response_cache.get("key") is not None
+
+    handle_cache_notification("another-process")
+    assert response_cache.get("key") is None
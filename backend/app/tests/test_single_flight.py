@@ -0,0 +1,113 @@
+# app/tests/test_single_flight.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.work_claim import WorkClaim
+from app.utils.single_flight import SingleFlight, try_claim, work_claim
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return {"summary": "shared"}
+
+    waiters = [
+        asyncio.create_task(flight.do(("report", 1, "en"), compute)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def compute(key):
+        await asyncio.sleep(0)
+        return key
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: compute("a")), flight.do("b", lambda: compute("b"))
+    )
+    assert results == ["a", "b"]
+
+
+async def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream failed")
+
+    results = await asyncio.gather(
+        flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+    )
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await flight.do("key", failing)
+    assert len(calls) == 2
+
+
+async def test_cancelled_waiter_does_not_abort_the_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def compute():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", compute))
+    second = asyncio.create_task(flight.do("key", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+
+
+async def test_work_claims_serialize_holders(db):
+    order = []
+
+    async def hold(name):
+        async with work_claim("analysis:1:report:en", 60, poll_interval=0.01):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.05)
+            order.append(f"{name} end")
+
+    await asyncio.gather(hold("a"), hold("b"))
+
+    assert order in (
+        ["a start", "a end", "b start", "b end"],
+        ["b start", "b end", "a start", "a end"],
+    )
+    assert (await db.execute(select(WorkClaim))).scalars().all() == []
+
+
+async def test_stale_work_claims_expire(db):
+    db.add(
+        WorkClaim(
+            key="analysis:1:report:en",
+            claimed_at=datetime.now(timezone.utc) - timedelta(seconds=120),
+        )
+    )
+    await db.commit()
+
+    assert not await try_claim("analysis:1:report:en", 600)
+    assert await try_claim("analysis:1:report:en", 60)
@@ -1,10 +1,16 @@
-import instructor
-from anthropic import AsyncAnthropic
+import asyncio
+import json
+import logging
 from app.core.config import settings
-from typing import List, Optional
+from app.utils.llm_backend import get_llm_client
+from app.utils.llm_usage import record_usage
+from app.utils.report_chunking import clean_text, estimate_tokens, split_into_chunks
+from typing import Any, List, Optional, Type
 from pydantic import BaseModel, Field
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class Language(str, Enum):
     ENGLISH = "en"
@@ -54,60 +60,185 @@ class MapAnalysis(BaseModel):
     )
 
 
-instructor_client = instructor.from_anthropic(
-    AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-)
-
 language_prompts = {
     Language.ENGLISH: "Provide the analysis in English",
     Language.SPANISH: "Proporcione el análisis en español",
     Language.FRENCH: "Fournissez l'analyse en français",
 }
 
+language_names = {
+    Language.ENGLISH: "English",
+    Language.SPANISH: "Spanish",
+    Language.FRENCH: "French",
+}
 
-async def generate_report_analysis(
-    disaster: str, report_title: str, report_content: str, lang: str
-) -> Timeline:
 
+async def complete(
+    client: Any,
+    messages: List[dict],
+    response_model: Type[BaseModel],
+    max_tokens: int = 4096,
+) -> BaseModel:
+    """Make a structured-output call, recording its token usage."""
+    response, completion = await client.chat.completions.create_with_completion(
+        model=settings.LLM_MODEL,
+        messages=messages,
+        max_tokens=max_tokens,
+        response_model=response_model,
+    )
+    images = sum(
+        1
+        for message in messages
+        if isinstance(message["content"], list)
+        for block in message["content"]
+        if block.get("type") == "image"
+    )
+    record_usage(getattr(completion, "usage", None), images)
+    return response
+
+
+async def generate_report_analysis(
+    disaster: str,
+    report_title: str,
+    report_content: str,
+    lang: str,
+    client: Optional[Any] = None,
+) -> DisasterAnalysis:
+    """
+    Analyze a situation report, map-reducing over chunks when it is large.
+
+    A report that fits in REPORT_CHUNK_TOKENS is analyzed as is in a single
+    call. A larger one is cleaned of boilerplate and split by page and
+    section; if it still needs several chunks they are analyzed concurrently
+    and the partial analyses merged by a final call.
+    """
+    client = client or get_llm_client()
     lang_prompt = language_prompts.get(lang, language_prompts[Language.ENGLISH])
 
-    prompt = f"Generate a timeline of events, impact analysis and needs analysis for the disaster '{disaster}' based on the following report. {lang_prompt}:\n\n"
+    if estimate_tokens(report_content) > settings.REPORT_CHUNK_TOKENS:
+        report_content = clean_text(report_content)
+    chunks = split_into_chunks(report_content, settings.REPORT_CHUNK_TOKENS)
+    if len(chunks) > settings.REPORT_MAX_CHUNKS:
+        logger.warning(
+            f"Analyzing the first {settings.REPORT_MAX_CHUNKS} of {len(chunks)} chunks of '{report_title}'"
+        )
+        chunks = chunks[: settings.REPORT_MAX_CHUNKS]
 
-    prompt += f"Title: {report_title}\n\nContent: {report_content}"
+    if len(chunks) <= 1:
+        prompt = f"Generate a timeline of events, impact analysis and needs analysis for the disaster '{disaster}' based on the following report. {lang_prompt}:\n\n"
 
-    return await instructor_client.chat.completions.create(
-        model="claude-3-5-sonnet-20240620",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=4096,
-        response_model=DisasterAnalysis,
+        prompt += f"Title: {report_title}\n\nContent: {chunks[0] if chunks else ''}"
+
+        return await complete(
+            client, [{"role": "user", "content": prompt}], DisasterAnalysis
+        )
+
+    semaphore = asyncio.Semaphore(settings.REPORT_CHUNK_CONCURRENCY)
+
+    async def analyze_chunk(number: int, chunk: str) -> DisasterAnalysis:
+        prompt = f"Generate a timeline of events, impact analysis and needs analysis for the disaster '{disaster}' based on part {number} of {len(chunks)} of the following report. Only use information from this part. {lang_prompt}:\n\n"
+
+        prompt += f"Title: {report_title}\n\nContent: {chunk}"
+
+        async with semaphore:
+            return await complete(
+                client, [{"role": "user", "content": prompt}], DisasterAnalysis
+            )
+
+    partial_analyses = await asyncio.gather(
+        *(analyze_chunk(number, chunk) for number, chunk in enumerate(chunks, 1))
     )
 
+    prompt = f"Merge the following partial analyses of consecutive parts of the report '{report_title}' on the disaster '{disaster}' into one analysis. Write a single executive summary, combine the timelines in date order without duplicate events, use the latest figures for affected people, and merge the needs without repetition. {lang_prompt}:\n\n"
 
-async def generate_map_analysis(
-    disaster: str, map_title: str, encoded_images: List[str], lang: str
-) -> DisasterAnalysis:
-    lang_prompt = language_prompts.get(lang, language_prompts[Language.ENGLISH])
+    prompt += "\n\n".join(
+        f"Part {number}: {analysis.model_dump_json()}"
+        for number, analysis in enumerate(partial_analyses, 1)
+    )
+
+    return await complete(
+        client, [{"role": "user", "content": prompt}], DisasterAnalysis
+    )
+
+
+# Kept free of anything page- or disaster-specific so that descriptions can
+# be reused for any map sharing the page
+MAP_PAGE_INSTRUCTIONS = """Describe the map page in the following image for an analyst who cannot see it. Cover:
+- the area shown, with country, region and place names as printed
+- the hazard or situation mapped and its extent
+- what the legend says each colour, symbol and shading means
+- any figures printed on the page, such as people affected, displaced or in need
+- the date, source and title of the map if shown
+If the page is only a logo, a legend or a disclaimer, say so in one sentence.
+Do not guess at anything that is not on the page."""
+
+
+class PageDescription(BaseModel):
+    description: str = Field(..., description="Description of the map page")
+
+
+async def describe_map_page(
+    encoded_image: str,
+    media_type: str = "image/png",
+    client: Optional[Any] = None,
+) -> str:
+    """Describe one rendered map page in English."""
+    client = client or get_llm_client()
 
     content = [
+        {"type": "text", "text": MAP_PAGE_INSTRUCTIONS},
         {
             "type": "image",
             "source": {
                 "type": "base64",
-                "media_type": "image/png",
-                "data": encoded_png,
+                "media_type": media_type,
+                "data": encoded_image,
             },
-        }
-        for encoded_png in encoded_images
+        },
     ]
 
-    prompt = f"Analyze the following map images from '{map_title}' related to the disaster '{disaster}'. {lang_prompt}."
-    content.append({"type": "text", "text": prompt})
+    page = await complete(
+        client, [{"role": "user", "content": content}], PageDescription, 1024
+    )
+    return page.description
 
-    messages = [{"role": "user", "content": content}]
 
-    return await instructor_client.chat.completions.create(
-        model="claude-3-5-sonnet-20240620",
-        messages=messages,
-        max_tokens=4096,
-        response_model=MapAnalysis,
+async def generate_map_analysis(
+    disaster: str,
+    map_title: str,
+    page_descriptions: List[str],
+    lang: str,
+    client: Optional[Any] = None,
+) -> MapAnalysis:
+    """Analyze a map from descriptions of its distinct pages."""
+    client = client or get_llm_client()
+    lang_prompt = language_prompts.get(lang, language_prompts[Language.ENGLISH])
+
+    prompt = "Analyze a disaster map from descriptions of its pages. Describe the geographical extent of the disaster, list the affected areas, and give the key findings the map supports. Ignore pages that are only logos, legends or disclaimers.\n\n"
+
+    prompt += f"Map: '{map_title}'\nDisaster: '{disaster}'\n\n"
+
+    prompt += "\n\n".join(
+        f"Page {number}: {description}"
+        for number, description in enumerate(page_descriptions, 1)
     )
+
+    prompt += f"\n\n{lang_prompt}."
+
+    return await complete(client, [{"role": "user", "content": prompt}], MapAnalysis)
+
+
+async def translate_analysis(
+    analysis: dict,
+    response_model: Type[BaseModel],
+    lang: str,
+    client: Optional[Any] = None,
+) -> BaseModel:
+    client = client or get_llm_client()
+    language = language_names.get(lang, language_names[Language.ENGLISH])
+
+    prompt = f"Translate the text of the following disaster analysis into {language}. Keep the structure, dates, numbers and place names unchanged:\n\n"
+
+    prompt += json.dumps(analysis, ensure_ascii=False)
+
+    return await complete(client, [{"role": "user", "content": prompt}], response_model)
@@ -0,0 +1,386 @@
+# app/utils/disaster_analysis.py
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.analysis import Analysis
+from app.models.disaster import Disaster
+from app.models.map_page_description import MapPageDescription
+from app.models.report import Report
+from app.utils.disaster_summary import refresh_disaster_summary
+from app.utils.image_hash import drop_near_duplicates
+from app.utils.image_store import (
+    MapPage,
+    load_report_images,
+    map_page,
+    save_report_images,
+)
+from app.utils.pdf_extractor import extract_text_from_pdf_url, render_pdf_images
+from app.utils.ai_analysis import (
+    DisasterAnalysis,
+    Language,
+    MapAnalysis,
+    describe_map_page,
+    generate_map_analysis,
+    generate_report_analysis,
+    translate_analysis,
+)
+from app.utils.llm_usage import track_usage
+from app.utils.response_cache import invalidate_cached_responses
+from app.utils.single_flight import SingleFlight, work_claim
+
+logger = logging.getLogger(__name__)
+
+# Disaster column holding each type of analysis
+ANALYSIS_COLUMNS = {
+    "report": "report_analysis",
+    "map": "map_analysis",
+    "news": "news_analysis",
+}
+
+# Content format of the report each type of analysis is built from
+SOURCE_FORMATS = {
+    "report": settings.CONTENT_FORMAT_SITUATION_REPORT,
+    "map": settings.CONTENT_FORMAT_MAP,
+    "news": settings.CONTENT_FORMAT_NEWS,
+}
+
+SOURCE_NOT_FOUND = {
+    "report": "No situation report found for this disaster",
+    "map": "No Map found for this disaster",
+    "news": "No News found for this disaster",
+}
+
+# Structured output of the analyses that are translated between languages
+ANALYSIS_MODELS = {
+    "report": DisasterAnalysis,
+    "map": MapAnalysis,
+}
+
+analysis_flight = SingleFlight()
+
+
+async def get_latest_source_report(
+    db: AsyncSession, disaster_id: int, analysis_type: str
+) -> Report:
+    result = await db.execute(
+        select(Report)
+        .filter(
+            Report.disaster_id == disaster_id,
+            Report.content_format_id == SOURCE_FORMATS[analysis_type],
+        )
+        .order_by(desc(Report.date_created))
+        .limit(1)
+    )
+    report = result.scalar_one_or_none()
+    if not report:
+        raise HTTPException(status_code=404, detail=SOURCE_NOT_FOUND[analysis_type])
+    return report
+
+
+async def get_cached_analysis(
+    db: AsyncSession,
+    disaster_id: int,
+    analysis_type: str,
+    source_report_id: int,
+    lang: Optional[str] = None,
+) -> Optional[Analysis]:
+    """Look up an analysis of a source report, in ``lang`` or in any language."""
+    query = select(Analysis).filter(
+        Analysis.disaster_id == disaster_id,
+        Analysis.analysis_type == analysis_type,
+        Analysis.source_report_id == source_report_id,
+    )
+    if lang is not None:
+        query = query.filter(Analysis.lang == lang)
+    result = await db.execute(query.limit(1))
+    return result.scalar_one_or_none()
+
+
+async def get_or_compute_analysis(
+    disaster_id: int, analysis_type: str, lang: str
+) -> dict:
+    """
+    Return the analysis of the latest source report, computing it if missing.
+
+    Concurrent calls for the same disaster, type and language share a single
+    computation: within a process through single-flight, and across processes
+    through a work claim, after which the cache is re-checked.
+    """
+    key = (disaster_id, analysis_type, lang)
+    return await analysis_flight.do(key, lambda: _compute_analysis(*key))
+
+
+async def _compute_analysis(disaster_id: int, analysis_type: str, lang: str) -> dict:
+    async with work_claim(
+        f"analysis:{disaster_id}:{analysis_type}:{lang}",
+        # A claim outliving the job timeout was left by a process that died
+        stale_after=settings.JOB_TIMEOUT_SECONDS + 60,
+    ):
+        async with AsyncSessionLocal() as db:
+            disaster = await db.get(Disaster, disaster_id)
+            if disaster is None:
+                raise HTTPException(status_code=404, detail="Disaster not found")
+            source = await get_latest_source_report(db, disaster_id, analysis_type)
+            # Another process may have finished it while we waited for the claim
+            cached = await get_cached_analysis(
+                db, disaster_id, analysis_type, source.id, lang
+            )
+            if cached:
+                return cached.result
+
+            other = await get_cached_analysis(db, disaster_id, analysis_type, source.id)
+            existing = other.result if other else None
+            with track_usage() as usage:
+                if existing and analysis_type not in ANALYSIS_MODELS:
+                    # News analyses carry the report itself, the same in every
+                    # language
+                    result = existing
+                elif existing:
+                    # Translating an existing analysis is much cheaper than
+                    # analyzing the source documents again
+                    await db.commit()
+                    translated = await translate_analysis(
+                        existing["analysis"], ANALYSIS_MODELS[analysis_type], lang
+                    )
+                    result = {**existing, "analysis": translated.model_dump()}
+                else:
+                    result = await run_analysis(
+                        disaster, source, analysis_type, lang, db
+                    )
+            if usage.calls:
+                logger.info(
+                    f"Computed {analysis_type} analysis of disaster {disaster_id} in {lang}: {usage.as_dict()}"
+                )
+
+            db.add(
+                Analysis(
+                    disaster_id=disaster_id,
+                    analysis_type=analysis_type,
+                    lang=lang,
+                    source_report_id=source.id,
+                    result=result,
+                    usage=usage.as_dict(),
+                )
+            )
+            # The disaster keeps a copy of the English analysis for list and
+            # detail views, which is never read back here
+            if lang == Language.ENGLISH:
+                setattr(disaster, ANALYSIS_COLUMNS[analysis_type], result)
+            await db.commit()
+            if lang == Language.ENGLISH and analysis_type == "report":
+                # The summary carries figures from the report analysis
+                try:
+                    await refresh_disaster_summary()
+                except Exception:
+                    logger.exception("Failed to refresh the disaster summary")
+            # Extracted report text and the disaster's analyses may have
+            # changed
+            await invalidate_cached_responses()
+            return result
+
+
+async def run_analysis(
+    disaster: Disaster,
+    source: Report,
+    analysis_type: str,
+    lang: str,
+    db: AsyncSession,
+) -> dict:
+    match analysis_type:
+        case "report":
+            return await analyze_report(disaster.name, source, lang, db)
+        case "map":
+            return await analyze_map(disaster.id, disaster.name, source, lang, db)
+        case "news":
+            return await analyze_news(disaster.id, source, lang, db)
+    raise ValueError(f"Unknown analysis type: {analysis_type}")
+
+
+async def analyze_report(
+    disaster_name: str, latest_report: Report, lang: str, db: AsyncSession
+) -> dict:
+    # Load the text previously extracted from the situation report
+    await db.refresh(latest_report, ["extracted_report"])
+
+    # End the read transaction so no connection is held while the PDF is
+    # downloaded and the model runs
+    await db.commit()
+
+    # Extract the text from the situation report
+    if latest_report.extracted_report:
+        extracted_text = latest_report.extracted_report
+    elif (
+        latest_report.file
+        and isinstance(latest_report.file, list)
+        and len(latest_report.file) > 0
+    ):
+        pdf_url = latest_report.file[0].get("url")
+        if not pdf_url:
+            raise HTTPException(
+                status_code=404, detail="No valid PDF URL found for the latest report"
+            )
+        extracted_text = await extract_text_from_pdf_url(pdf_url)
+        # Update the report with the extracted text
+        latest_report.extracted_report = extracted_text
+        await db.commit()
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail="No content available for analysis in the latest report",
+        )
+
+    # Perform AI analysis on the extracted text
+    report_analysis = await generate_report_analysis(
+        disaster_name, latest_report.title, extracted_text, lang
+    )
+
+    # Return the analysis results
+    return {
+        "latest_report_id": latest_report.id,
+        "latest_report_title": latest_report.title,
+        "latest_report_date": latest_report.date_created.isoformat(),
+        "latest_report_url": latest_report.url,
+        "latest_report_sources": latest_report.source,
+        "type": "report",
+        "analysis": report_analysis.model_dump(),
+    }
+
+
+async def analyze_map(
+    disaster_id: int,
+    disaster_name: str,
+    latest_map: Report,
+    lang: str,
+    db: AsyncSession,
+) -> dict:
+    await db.refresh(latest_map, ["extracted_maps"])
+    # Load the stored map images, extracting them from the Map PDF if needed.
+    # Sync clears extracted_maps when the map changes, which marks stored
+    # images as stale.
+    pages = None
+    if latest_map.extracted_maps:
+        pages = await load_report_images(db, latest_map.id)
+    # End the read transaction so no connection is held while the PDF is
+    # downloaded and the model runs
+    await db.commit()
+    if not pages:
+        if not (
+            latest_map.file
+            and isinstance(latest_map.file, list)
+            and len(latest_map.file) > 0
+        ):
+            raise HTTPException(
+                status_code=404,
+                detail="No images available for analysis in the latest map",
+            )
+        pdf_url = latest_map.file[0].get("url")
+        if not pdf_url:
+            raise HTTPException(
+                status_code=404, detail="No valid PDF URL found for the latest Map"
+            )
+        rendered_images = await render_pdf_images(pdf_url)
+        # Store the images and point the map at them
+        await save_report_images(db, latest_map, rendered_images)
+        await db.commit()
+        pages = [map_page(image) for image in rendered_images]
+
+    # Map products repeat base layers, legends and logo pages; only
+    # distinct pages are described
+    distinct_pages = drop_near_duplicates(
+        pages, [page.phash for page in pages], settings.MAP_DUPLICATE_DISTANCE
+    )
+    descriptions = await describe_map_pages(db, distinct_pages)
+    logger.info(
+        f"Map '{latest_map.title}': {len(pages)} pages, {len(distinct_pages)} distinct"
+    )
+
+    # Perform AI analysis on the map page descriptions
+    map_analysis = await generate_map_analysis(
+        disaster_name,
+        latest_map.title,
+        [descriptions[page.sha256] for page in distinct_pages],
+        lang,
+    )
+
+    # Return the map analysis data
+    return {
+        "disaster_id": disaster_id,
+        "latest_map_title": latest_map.title,
+        "latest_map_date": latest_map.date_created.isoformat(),
+        "latest_map_url": latest_map.url,
+        "latest_map_image_url": latest_map.file[0].get("preview").get("url"),
+        "type": "map",
+        "analysis": map_analysis.model_dump(),
+    }
+
+
+async def describe_map_pages(db: AsyncSession, pages: List[MapPage]) -> Dict[str, str]:
+    """
+    Describe map pages by their SHA-256, reusing descriptions of pages seen
+    in earlier maps and storing new ones. Leaves no transaction open.
+    """
+    hashes = list({page.sha256 for page in pages})
+    result = await db.execute(
+        select(MapPageDescription).filter(
+            MapPageDescription.sha256.in_(hashes),
+            MapPageDescription.model == settings.LLM_MODEL,
+        )
+    )
+    descriptions = {row.sha256: row.description for row in result.scalars()}
+    await db.commit()
+
+    missing = list(
+        {
+            page.sha256: page for page in pages if page.sha256 not in descriptions
+        }.values()
+    )
+    if not missing:
+        return descriptions
+
+    semaphore = asyncio.Semaphore(settings.MAP_PAGE_CONCURRENCY)
+
+    async def describe(page: MapPage) -> str:
+        async with semaphore:
+            return await describe_map_page(page.data, page.media_type)
+
+    new_descriptions = await asyncio.gather(*(describe(page) for page in missing))
+    for page, description in zip(missing, new_descriptions):
+        descriptions[page.sha256] = description
+        try:
+            async with db.begin_nested():
+                db.add(
+                    MapPageDescription(
+                        sha256=page.sha256,
+                        model=settings.LLM_MODEL,
+                        description=description,
+                    )
+                )
+        except IntegrityError:
+            # A concurrent analysis described the same page
+            pass
+    await db.commit()
+    return descriptions
+
+
+async def analyze_news(
+    disaster_id: int, latest_news: Report, lang: str, db: AsyncSession
+) -> dict:
+    await db.refresh(latest_news, ["body"])
+
+    # Return the news analysis data
+
+    return {
+        "disaster_id": disaster_id,
+        "type": "news",
+        "latest_news_title": latest_news.title,
+        "latest_news_date": latest_news.date_created.isoformat(),
+        "latest_news_content": latest_news.body,
+        "latest_news_url": latest_news.url,
+    }
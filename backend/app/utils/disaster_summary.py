@@ -0,0 +1,17 @@
+# app/utils/disaster_summary.py
+from sqlalchemy import text
+from app.db.session import engine
+
+
+async def refresh_disaster_summary():
+    """
+    Refresh the disaster_summary materialized view without blocking reads.
+    On databases other than PostgreSQL it is a plain view and always fresh.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY disaster_summary")
+        )
@@ -0,0 +1,108 @@
+# app/utils/fake_llm.py
+import asyncio
+import json
+import time
+import typing
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Tuple, Type
+from pydantic import BaseModel
+from app.utils.report_chunking import estimate_tokens
+
+
+def build_placeholder(annotation: Any) -> Any:
+    """Build a deterministic value that validates against ``annotation``."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        return build_placeholder(next(arg for arg in args if arg is not type(None)))
+    if origin in (list, List):
+        return [build_placeholder(args[0] if args else str)]
+    if origin in (dict, Dict):
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation(
+            **{
+                name: build_placeholder(field.annotation)
+                for name, field in annotation.model_fields.items()
+            }
+        )
+    if annotation is int:
+        return 0
+    if annotation is float:
+        return 0.0
+    if annotation is bool:
+        return False
+    return "placeholder"
+
+
+class FakeLLMClient:
+    """
+    Stands in for the instructor client without network access.
+
+    Returns placeholder instances of the requested response model after a
+    fixed latency, and records calls with estimated token counts so
+    pipelines can be measured offline. Also serves as the "stub" LLM backend
+    for load tests, so only the most recent calls are kept.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, output_tokens: int = 500, max_recorded: int = 1000
+    ):
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.calls: Deque[Dict[str, Any]] = deque(maxlen=max_recorded)
+        self._usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(
+                create=self.create, create_with_completion=self.create_with_completion
+            )
+        )
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int,
+        response_model: Type[BaseModel],
+        **kwargs,
+    ) -> BaseModel:
+        response, _ = await self.create_with_completion(
+            model, messages, max_tokens, response_model, **kwargs
+        )
+        return response
+
+    async def create_with_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int,
+        response_model: Type[BaseModel],
+        **kwargs,
+    ) -> Tuple[BaseModel, Any]:
+        """Like ``create``, also returning a completion carrying its usage."""
+        started = time.monotonic()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        call = {
+            "model": model,
+            "response_model": response_model.__name__,
+            "input_tokens": estimate_tokens(json.dumps(messages)),
+            "output_tokens": min(self.output_tokens, max_tokens),
+            "latency": time.monotonic() - started,
+        }
+        self.calls.append(call)
+        self._usage["calls"] += 1
+        self._usage["input_tokens"] += call["input_tokens"]
+        self._usage["output_tokens"] += call["output_tokens"]
+        completion = SimpleNamespace(
+            usage=SimpleNamespace(
+                input_tokens=call["input_tokens"], output_tokens=call["output_tokens"]
+            )
+        )
+        return build_placeholder(response_model), completion
+
+    @property
+    def usage(self) -> Dict[str, int]:
+        """Total calls and estimated tokens since creation."""
+        return dict(self._usage)
@@ -0,0 +1,56 @@
+# app/utils/image_hash.py
+from typing import List, Sequence, TypeVar
+from PIL import Image
+
+# Side of the gradient grid; the hash has HASH_SIZE ** 2 bits
+HASH_SIZE = 16
+
+T = TypeVar("T")
+
+
+def dhash(img: Image.Image) -> str:
+    """
+    Difference hash of an image as a hex string.
+
+    Each bit records whether brightness increases between horizontally
+    adjacent cells of a downscaled grayscale copy, so re-encoded or slightly
+    re-rendered pages hash within a few bits of each other.
+    """
+    small = img.convert("L").resize(
+        (HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS
+    )
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            bits = bits << 1 | (right > left)
+    return f"{bits:0{HASH_SIZE ** 2 // 4}x}"
+
+
+def hamming_distance(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def drop_near_duplicates(
+    items: Sequence[T], hashes: Sequence[str], max_distance: int
+) -> List[T]:
+    """
+    Keep the first of each group of items whose hashes are within
+    ``max_distance`` bits of each other, in their original order. Items
+    without a hash are always kept.
+    """
+    kept: List[T] = []
+    seen: List[str] = []
+    for item, item_hash in zip(items, hashes):
+        if item_hash and any(
+            len(item_hash) == len(other)
+            and hamming_distance(item_hash, other) <= max_distance
+            for other in seen
+        ):
+            continue
+        if item_hash:
+            seen.append(item_hash)
+        kept.append(item)
+    return kept
@@ -0,0 +1,160 @@
+# app/utils/image_store.py
+import asyncio
+import base64
+import hashlib
+import io
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from PIL import Image
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.models.report import Report
+from app.models.report_image import ReportImage
+from app.utils.image_hash import dhash
+from app.utils.pdf_extractor import RenderedImage
+
+EXTENSIONS = {"image/png": "png", "image/webp": "webp"}
+
+
+class MapPage(NamedTuple):
+    data: str  # base64
+    media_type: str
+    sha256: str
+    phash: str
+
+
+def map_page(image: RenderedImage) -> MapPage:
+    return MapPage(
+        base64.b64encode(image.data).decode("utf-8"),
+        image.media_type,
+        hashlib.sha256(image.data).hexdigest(),
+        image.phash,
+    )
+
+
+class ImageStore:
+    """
+    Filesystem store for extracted map images, laid out as
+    ``<directory>/<report_id>/<page>.<ext>``.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def report_dir(self, report_id: int) -> Path:
+        return self.directory / str(report_id)
+
+    def write(
+        self, report_id: int, images: List[RenderedImage]
+    ) -> List[Tuple[Path, str]]:
+        """Replace the stored images of a report; returns each path and SHA-256."""
+        self.delete_report(report_id)
+        report_dir = self.report_dir(report_id)
+        report_dir.mkdir(parents=True, exist_ok=True)
+        stored = []
+        for page, image in enumerate(images):
+            path = report_dir / f"{page}.{EXTENSIONS[image.media_type]}"
+            path.write_bytes(image.data)
+            stored.append((path, hashlib.sha256(image.data).hexdigest()))
+        return stored
+
+    def delete_report(self, report_id: int):
+        shutil.rmtree(self.report_dir(report_id), ignore_errors=True)
+
+    def prune(self, report_ids: Iterable[int], min_age: float = 0):
+        """
+        Remove the images of every report not in ``report_ids``. Directories
+        modified in the last ``min_age`` seconds are kept, as their rows may
+        not be committed yet.
+        """
+        keep = {str(report_id) for report_id in report_ids}
+        if not self.directory.exists():
+            return
+        cutoff = time.time() - min_age
+        for path in self.directory.iterdir():
+            if (
+                path.is_dir()
+                and path.name not in keep
+                and path.stat().st_mtime < cutoff
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+image_store = ImageStore(settings.IMAGE_STORE_DIR)
+
+
+def image_reference(image: ReportImage) -> dict:
+    return {
+        "page": image.page,
+        "url": f"{settings.API_V1_STR}/reports/{image.report_id}/maps/{image.page}",
+        "media_type": image.media_type,
+        "width": image.width,
+        "height": image.height,
+    }
+
+
+async def save_report_images(
+    db: AsyncSession, report: Report, images: List[RenderedImage]
+) -> List[dict]:
+    """
+    Store rendered images for a report, replacing any previous ones, and point
+    ``report.extracted_maps`` at them. The caller commits.
+    """
+    await db.execute(delete(ReportImage).where(ReportImage.report_id == report.id))
+    stored = await asyncio.to_thread(image_store.write, report.id, images)
+    rows = [
+        ReportImage(
+            report_id=report.id,
+            page=page,
+            media_type=image.media_type,
+            width=image.width,
+            height=image.height,
+            size=len(image.data),
+            sha256=sha256,
+            phash=image.phash or None,
+            path=str(path),
+        )
+        for page, (image, (path, sha256)) in enumerate(zip(images, stored))
+    ]
+    db.add_all(rows)
+    report.extracted_maps = [image_reference(row) for row in rows]
+    return report.extracted_maps
+
+
+async def load_report_images(
+    db: AsyncSession, report_id: int
+) -> Optional[List[MapPage]]:
+    """
+    Load a report's stored images as map pages, or None if they are missing.
+    Hashes missing from images stored before they were recorded are computed
+    from the files.
+    """
+    result = await db.execute(
+        select(ReportImage)
+        .filter(ReportImage.report_id == report_id)
+        .order_by(ReportImage.page)
+    )
+    images = result.scalars().all()
+    if not images:
+        return None
+
+    def read(image: ReportImage) -> MapPage:
+        data = Path(image.path).read_bytes()
+        return MapPage(
+            base64.b64encode(data).decode("utf-8"),
+            image.media_type,
+            image.sha256 or hashlib.sha256(data).hexdigest(),
+            image.phash or dhash(Image.open(io.BytesIO(data))),
+        )
+
+    def read_all():
+        return [read(image) for image in images]
+
+    try:
+        return await asyncio.to_thread(read_all)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,219 @@
+# app/utils/job_queue.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.analysis_job import ACTIVE_JOB_STATUSES, AnalysisJob
+from app.utils.disaster_analysis import get_or_compute_analysis
+
+logger = logging.getLogger(__name__)
+
+# Set when a job is enqueued so idle workers in this process skip the poll wait
+_wakeup = asyncio.Event()
+_workers: List[asyncio.Task] = []
+
+
+async def get_active_job(
+    db: AsyncSession, disaster_id: int, analysis_type: str, lang: str
+) -> Optional[AnalysisJob]:
+    result = await db.execute(
+        select(AnalysisJob).filter(
+            AnalysisJob.disaster_id == disaster_id,
+            AnalysisJob.analysis_type == analysis_type,
+            AnalysisJob.lang == lang,
+            AnalysisJob.status.in_(ACTIVE_JOB_STATUSES),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def enqueue_analysis_job(
+    db: AsyncSession, disaster_id: int, analysis_type: str, lang: str
+) -> AnalysisJob:
+    """Queue an analysis, or return the job already queued or running for it."""
+    job = await get_active_job(db, disaster_id, analysis_type, lang)
+    if job:
+        return job
+
+    job = AnalysisJob(
+        disaster_id=disaster_id,
+        analysis_type=analysis_type,
+        lang=lang,
+        status="queued",
+        attempts=0,
+    )
+    db.add(job)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another request queued the same analysis in the meantime
+        await db.rollback()
+        job = await get_active_job(db, disaster_id, analysis_type, lang)
+        if job is None:
+            raise
+        return job
+    await db.refresh(job)
+    _wakeup.set()
+    return job
+
+
+async def claim_job() -> Optional[AnalysisJob]:
+    """
+    Take the oldest queued job and mark it running.
+
+    Jobs requeued after a failure wait until their ``available_at`` time.
+    Jobs left running by a worker that died are picked up again once they
+    have run for longer than the job timeout. SKIP LOCKED lets concurrent
+    workers, in this or other processes, claim different jobs without
+    blocking each other.
+    """
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS + 60)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(AnalysisJob)
+            .filter(
+                or_(
+                    and_(
+                        AnalysisJob.status == "queued",
+                        or_(
+                            AnalysisJob.available_at.is_(None),
+                            AnalysisJob.available_at <= now,
+                        ),
+                    ),
+                    and_(
+                        AnalysisJob.status == "running",
+                        AnalysisJob.started_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(AnalysisJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            return None
+        # The attempts guard keeps two workers from claiming the same job on
+        # databases without row locks, such as SQLite
+        claimed = await db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job.id, AnalysisJob.attempts == job.attempts)
+            .values(
+                status="running",
+                started_at=now,
+                attempts=job.attempts + 1,
+                error=None,
+            )
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return None
+        await db.refresh(job)
+        return job
+
+
+async def finish_job(
+    db: AsyncSession, job: AnalysisJob, status: str, error: Optional[str] = None
+):
+    await db.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job.id)
+        .values(status=status, error=error, finished_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+
+
+def retry_delay(job: AnalysisJob, timed_out: bool) -> timedelta:
+    """Back off exponentially between the attempts of a job."""
+    delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+    if timed_out:
+        # The timeout only stops waiting: the shared computation keeps running
+        # and may still finish and cache the analysis, so give it another full
+        # timeout before starting over
+        delay = max(delay, settings.JOB_TIMEOUT_SECONDS)
+    return timedelta(seconds=delay)
+
+
+async def process_job(job: AnalysisJob):
+    async with AsyncSessionLocal() as db:
+        if job.attempts > settings.JOB_MAX_ATTEMPTS:
+            await finish_job(
+                db, job, "failed", f"Gave up after {job.attempts - 1} attempts"
+            )
+            return
+
+        try:
+            await asyncio.wait_for(
+                get_or_compute_analysis(job.disaster_id, job.analysis_type, job.lang),
+                settings.JOB_TIMEOUT_SECONDS,
+            )
+        except HTTPException as e:
+            # Missing reports or files will not appear by retrying
+            logger.warning(f"Analysis job {job.id} failed: {e.detail}")
+            await finish_job(db, job, "failed", e.detail)
+            return
+        except Exception as e:
+            logger.exception(f"Analysis job {job.id} failed")
+            if job.attempts < settings.JOB_MAX_ATTEMPTS:
+                await db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job.id)
+                    .values(
+                        status="queued",
+                        error=repr(e),
+                        available_at=datetime.now(timezone.utc)
+                        + retry_delay(job, isinstance(e, asyncio.TimeoutError)),
+                    )
+                )
+                await db.commit()
+            else:
+                await finish_job(db, job, "failed", repr(e))
+            return
+
+        await finish_job(db, job, "succeeded")
+        logger.info(
+            f"Completed {job.analysis_type} analysis for disaster ID: {job.disaster_id}"
+        )
+
+
+async def job_worker():
+    while True:
+        try:
+            job = await claim_job()
+        except Exception:
+            logger.exception("Failed to claim an analysis job")
+            job = None
+
+        if job is None:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    _wakeup.wait(), settings.JOB_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await process_job(job)
+
+
+def start_job_workers():
+    for _ in range(settings.JOB_WORKER_CONCURRENCY):
+        _workers.append(asyncio.create_task(job_worker()))
+    logger.info(f"Started {len(_workers)} analysis job workers")
+
+
+async def stop_job_workers():
+    # Jobs interrupted here are picked up again once they turn stale
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
@@ -0,0 +1,35 @@
+# app/utils/llm_backend.py
+from functools import lru_cache
+from typing import Any
+from app.core.config import settings
+
+
+@lru_cache
+def get_llm_client() -> Any:
+    """
+    Return the structured-output client of the configured LLM backend.
+
+    Every backend exposes the instructor interface,
+    ``client.chat.completions.create(model, messages, max_tokens,
+    response_model)``, and ``create_with_completion`` with the same arguments,
+    which also returns the raw completion and its token usage. The client is
+    built on first use, so the stub backend needs neither network access nor
+    an API key.
+    """
+    match settings.LLM_BACKEND:
+        case "anthropic":
+            import instructor
+            from anthropic import AsyncAnthropic
+
+            if not settings.ANTHROPIC_API_KEY:
+                raise RuntimeError(
+                    "ANTHROPIC_API_KEY is required for the anthropic LLM backend"
+                )
+            return instructor.from_anthropic(
+                AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+            )
+        case "stub":
+            from app.utils.fake_llm import FakeLLMClient
+
+            return FakeLLMClient(latency=settings.LLM_STUB_LATENCY_SECONDS)
+    raise ValueError(f"Unknown LLM backend: {settings.LLM_BACKEND}")
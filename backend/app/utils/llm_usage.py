@@ -0,0 +1,63 @@
+# app/utils/llm_usage.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+
+class LLMUsage:
+    """Model calls, token counts and wall time spent on one piece of work."""
+
+    def __init__(self):
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.images = 0
+        self.started = time.monotonic()
+        self.latency: Optional[float] = None
+
+    def record(self, usage: Any, images: int = 0):
+        self.calls += 1
+        self.images += images
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        latency = self.latency
+        if latency is None:
+            latency = time.monotonic() - self.started
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "images": self.images,
+            "latency_seconds": round(latency, 3),
+        }
+
+
+_current_usage: ContextVar[Optional[LLMUsage]] = ContextVar(
+    "current_llm_usage", default=None
+)
+
+
+@contextmanager
+def track_usage() -> Iterator[LLMUsage]:
+    """
+    Collect the usage of every model call made in this context, including
+    calls from tasks it starts, until the block exits.
+    """
+    usage = LLMUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        usage.latency = time.monotonic() - usage.started
+        _current_usage.reset(token)
+
+
+def record_usage(usage: Any, images: int = 0):
+    current = _current_usage.get()
+    if current is not None:
+        current.record(usage, images)
@@ -0,0 +1,52 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import desc, tuple_
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(date_changed: datetime, id: int) -> str:
+    """Opaque token pointing just after the row with this sort key."""
+    payload = json.dumps([date_changed.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_changed, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(date_changed), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: Select, model, skip: int, limit: int, cursor: Optional[str] = None
+) -> Select:
+    """
+    Order a listing query newest first by (date_changed, id) and select a page.
+
+    With a cursor the page starts right after the cursor row, which lets the
+    database seek on the (date_changed, id) index instead of scanning past
+    `skip` rows. Without one, plain offset pagination is used.
+    """
+    query = query.order_by(desc(model.date_changed), desc(model.id)).limit(limit)
+    if cursor is None:
+        return query.offset(skip)
+    date_changed, id = decode_cursor(cursor)
+    return query.filter(tuple_(model.date_changed, model.id) < (date_changed, id))
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int) -> None:
+    """Expose the token for the following page, if there may be one."""
+    if len(rows) < limit:
+        return
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+        rows[-1].date_changed, rows[-1].id
+    )
@@ -0,0 +1,214 @@
+# app/utils/pdf_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+import httpx
+from app.core.config import settings
+from app.utils.single_flight import SingleFlight
+
+# Leases left behind by a process that died are removed after this long
+LEASE_MAX_AGE_SECONDS = 24 * 3600
+
+
+class PDFCache:
+    """
+    Content-addressed on-disk cache of downloaded PDFs.
+
+    Each URL has an index entry holding its ETag/Last-Modified validators and
+    the SHA-256 of its content; the content itself is stored once per digest.
+    Stale entries are revalidated with a conditional GET, the least recently
+    used blobs are evicted once the cache grows past ``max_bytes``, and
+    concurrent requests for the same URL share a single download.
+
+    Readers take a lease: a private hard link to the blob. A leased blob is
+    not evicted, and the link keeps the content readable even if another
+    process evicts it anyway.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._downloads = SingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(follow_redirects=True)
+        return self._client
+
+    async def get_path(self, url: str) -> Path:
+        """Return the path of the cached PDF for ``url``, downloading it if needed."""
+        return await self._downloads.do(url, lambda: self._fetch(url))
+
+    async def lease(self, url: str) -> Path:
+        """
+        Return a leased path to the cached PDF for ``url``, downloading it if
+        needed. It stays readable until passed to ``release``.
+        """
+        for attempt in range(2):
+            blob_path = await self.get_path(url)
+            try:
+                return await asyncio.to_thread(self._link_lease, blob_path)
+            except FileNotFoundError:
+                # Evicted before it could be leased; fetch it again
+                if attempt:
+                    raise
+
+    def release(self, lease_path: Path):
+        lease_path.unlink(missing_ok=True)
+
+    @asynccontextmanager
+    async def leased(self, url: str) -> AsyncIterator[Path]:
+        lease_path = await self.lease(url)
+        try:
+            yield lease_path
+        finally:
+            self.release(lease_path)
+
+    async def get(self, url: str) -> bytes:
+        """Return the content of the PDF at ``url``."""
+        async with self.leased(url) as path:
+            return await asyncio.to_thread(path.read_bytes)
+
+    async def _fetch(self, url: str) -> Path:
+        entry = self._read_entry(url)
+        blob_path = self._blob_path(entry["digest"]) if entry else None
+        headers = {}
+        if entry and blob_path.exists():
+            if time.time() - entry["fetched_at"] < self.ttl_seconds:
+                self._touch(blob_path)
+                return blob_path
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                entry["fetched_at"] = time.time()
+                self._write_entry(url, entry)
+                self._touch(blob_path)
+                return blob_path
+            response.raise_for_status()
+            blob_path, size = await self._store(response)
+
+        self._write_entry(
+            url,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "digest": blob_path.stem,
+                "size": size,
+                "fetched_at": time.time(),
+            },
+        )
+        await asyncio.to_thread(self._evict, blob_path)
+        return blob_path
+
+    async def _store(self, response: httpx.Response):
+        blobs_dir = self.directory / "blobs"
+        blobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = blobs_dir / f".{os.getpid()}-{id(response)}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            blob_path = self._blob_path(digest.hexdigest())
+            os.replace(tmp_path, blob_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return blob_path, size
+
+    def _link_lease(self, blob_path: Path) -> Path:
+        leases_dir = self.directory / "leases"
+        leases_dir.mkdir(parents=True, exist_ok=True)
+        lease_path = leases_dir / f"{os.getpid()}-{uuid.uuid4().hex}.pdf"
+        try:
+            os.link(blob_path, lease_path)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            # Filesystems without hard links get a copy
+            shutil.copyfile(blob_path, lease_path)
+        return lease_path
+
+    def _evict(self, keep: Path):
+        # A lease shares its blob's inode, so its age is that of its last
+        # link change rather than the blob's modification time
+        cutoff = time.time() - LEASE_MAX_AGE_SECONDS
+        for path in (self.directory / "leases").glob("*.pdf"):
+            try:
+                if path.stat().st_ctime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+        blobs = []
+        for path in (self.directory / "blobs").glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, stat.st_nlink > 1, path))
+        total = sum(size for _, size, _, _ in blobs)
+        for _, size, leased, path in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            # Leased blobs are being read
+            if path == keep or leased:
+                continue
+            # Index entries that point at an evicted blob are refetched on
+            # their next use.
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / "blobs" / f"{digest}.pdf"
+
+    def _entry_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "index" / f"{key}.json"
+
+    def _read_entry(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self._entry_path(url).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_entry(self, url: str, entry: dict):
+        path = self._entry_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+pdf_cache = PDFCache(
+    settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_BYTES, settings.PDF_CACHE_TTL_SECONDS
+)
@@ -4,25 +4,211 @@ import base64
 import httpx
 import fitz  # PyMuPDF
 import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import AsyncIterator, List, Literal, NamedTuple, Optional, Tuple
 from fastapi import HTTPException
 from PIL import Image
+from app.core.config import settings
+from app.utils.image_hash import dhash
+from app.utils.pdf_cache import pdf_cache
+from app.utils.report_chunking import PAGE_BREAK
+
+MAX_ZOOM = 300 / 72
+
+# Pages extracted per pool task when streaming text
+STREAM_BATCH_PAGES = 4
+
+
+class RenderedImage(NamedTuple):
+    data: bytes
+    media_type: str
+    width: int
+    height: int
+    # Difference hash of the rendered page, for spotting near duplicates
+    phash: str = ""
+
+
+_executor = None
+
+
+def pdf_worker_count() -> int:
+    return settings.PDF_WORKERS or os.cpu_count() or 1
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound PDF work, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=pdf_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _discard_broken_executor(executor: ProcessPoolExecutor):
+    # Concurrent callers may all see the same broken pool; only the first
+    # one replaces it.
+    global _executor
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+# The functions below run in the worker processes. They take the path of the
+# cached PDF rather than its bytes so that nothing large is pickled per task.
+
+
+def _page_count(pdf_path: str) -> int:
+    with fitz.open(pdf_path, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    with fitz.open(pdf_path, filetype="pdf") as doc:
+        return [doc.load_page(page_num).get_text() for page_num in range(start, stop)]
+
+
+def _extract_text(pdf_path: str, start: int, stop: int) -> str:
+    return PAGE_BREAK.join(_extract_pages(pdf_path, start, stop))
+
+
+def _fit_zoom(rect: fitz.Rect, max_size: tuple) -> float:
+    # Never render finer than the old fixed 300 DPI.
+    return min(max_size[0] / rect.width, max_size[1] / rect.height, MAX_ZOOM)
+
+
+def _render_clip(
+    page, clip, zoom: float, quality: int, max_size: tuple, image_format: str
+) -> RenderedImage:
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+    if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    image_data = io.BytesIO()
+    img.save(image_data, format=image_format.upper(), optimize=True, quality=quality)
+    return RenderedImage(
+        image_data.getvalue(),
+        f"image/{image_format}",
+        img.size[0],
+        img.size[1],
+        dhash(img),
+    )
+
+
+def _render_page(
+    pdf_path: str,
+    page_num: int,
+    quality: int,
+    max_size: tuple,
+    sizing: str,
+    tile_grid: int,
+    image_format: str,
+) -> List[RenderedImage]:
+    with fitz.open(pdf_path, filetype="pdf") as doc:
+        page = doc.load_page(page_num)
+        rect = page.rect
+        if sizing == "dpi":
+            # Legacy behaviour: render at 300 DPI and downscale afterwards.
+            return [_render_clip(page, None, MAX_ZOOM, quality, max_size, image_format)]
+
+        images = [
+            _render_clip(
+                page, None, _fit_zoom(rect, max_size), quality, max_size, image_format
+            )
+        ]
+        if tile_grid > 1:
+            # Detail tiles, each rendered at max_size in its own right.
+            width = rect.width / tile_grid
+            height = rect.height / tile_grid
+            for row in range(tile_grid):
+                for col in range(tile_grid):
+                    tile = fitz.Rect(
+                        rect.x0 + col * width,
+                        rect.y0 + row * height,
+                        rect.x0 + (col + 1) * width,
+                        rect.y0 + (row + 1) * height,
+                    )
+                    images.append(
+                        _render_clip(
+                            page,
+                            tile,
+                            _fit_zoom(tile, max_size),
+                            quality,
+                            max_size,
+                            image_format,
+                        )
+                    )
+        return images
+
+
+async def _run_in_pool(func, *args):
+    """
+    Run ``func`` in the process pool. A worker that dies, e.g. killed for
+    running out of memory, breaks the whole pool, so it is replaced and the
+    call retried once.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = get_pdf_executor()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            _discard_broken_executor(executor)
+            if attempt:
+                raise
 
 
 async def extract_text_from_pdf_url(url: str) -> str:
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        async with pdf_cache.leased(url) as leased_path:
+            pdf_path = str(leased_path)
+            page_count = await _run_in_pool(_page_count, pdf_path)
 
-            pdf_content = response.content
-            pdf_file = io.BytesIO(pdf_content)
+            # Split the pages into one contiguous range per worker.
+            step = max(1, -(-page_count // pdf_worker_count()))
+            texts = await asyncio.gather(
+                *(
+                    _run_in_pool(
+                        _extract_text, pdf_path, start, min(start + step, page_count)
+                    )
+                    for start in range(0, page_count, step)
+                )
+            )
+        return PAGE_BREAK.join(texts)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code, detail=f"HTTP error occurred: {e}"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
-            doc = fitz.open(stream=pdf_file, filetype="pdf")
-            text = ""
-            for page in doc:
-                text += page.get_text()
 
-            return text
+async def open_pdf_url(url: str) -> Tuple[str, int]:
+    """
+    Fetch the PDF at ``url`` into the cache; returns a leased path to it and
+    its page count. Pass the path to ``close_pdf`` once done with it.
+    """
+    try:
+        leased_path = await pdf_cache.lease(url)
+        try:
+            return str(leased_path), await _run_in_pool(_page_count, str(leased_path))
+        except BaseException:
+            pdf_cache.release(leased_path)
+            raise
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code, detail=f"HTTP error occurred: {e}"
@@ -31,42 +217,90 @@ async def extract_text_from_pdf_url(url: str) -> str:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
-async def pdf_to_base64_pngs(
-    url: str, quality: int = 75, max_size: tuple = (1024, 1024)
-):
-    async def process_page(page):
-        pix = page.get_pixmap(matrix=fitz.Matrix(300 / 72, 300 / 72))
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+def close_pdf(pdf_path: str):
+    """Release a path returned by ``open_pdf_url``."""
+    pdf_cache.release(Path(pdf_path))
 
-        if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
 
-        image_data = io.BytesIO()
-        img.save(image_data, format="PNG", optimize=True, quality=quality)
-        image_data.seek(0)
-        return base64.b64encode(image_data.getvalue()).decode("utf-8")
+async def iter_pdf_text(pdf_path: str, page_count: int) -> AsyncIterator[str]:
+    """
+    Yield the text of each page of a cached PDF in order, as soon as it and
+    every page before it have been extracted.
 
+    Pages are extracted in small batches spread over the process pool, so
+    later batches are already running while earlier pages are consumed.
+    """
+    batches = [
+        asyncio.ensure_future(
+            _run_in_pool(
+                _extract_pages,
+                pdf_path,
+                start,
+                min(start + STREAM_BATCH_PAGES, page_count),
+            )
+        )
+        for start in range(0, page_count, STREAM_BATCH_PAGES)
+    ]
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        for batch in batches:
+            for text in await batch:
+                yield text
+    finally:
+        # The consumer may stop early, e.g. when a client disconnects
+        for batch in batches:
+            batch.cancel()
 
-            pdf_content = response.content
-            pdf_file = io.BytesIO(pdf_content)
 
-            doc = fitz.open(stream=pdf_file, filetype="pdf")
-            tasks = [
-                asyncio.create_task(process_page(doc.load_page(page_num)))
-                for page_num in range(doc.page_count)
-            ]
+async def render_pdf_images(
+    url: str,
+    quality: int = 75,
+    max_size: tuple = (1024, 1024),
+    sizing: Optional[Literal["fit", "dpi"]] = None,
+    tile_grid: Optional[int] = None,
+    image_format: Optional[Literal["png", "webp"]] = None,
+) -> List[RenderedImage]:
+    """
+    Render each page of the PDF at ``url`` to an encoded image.
 
-            base64_encoded_pngs = await asyncio.gather(*tasks)
+    With ``sizing="fit"`` the zoom factor is computed from the page size so
+    the render lands directly within ``max_size``; ``"dpi"`` renders at 300
+    DPI and downscales. A ``tile_grid`` above 1 adds that many rows and columns
+    of detail tiles after each page's overview image.
+    """
+    sizing = sizing or settings.MAP_RENDER_SIZING
+    tile_grid = tile_grid or settings.MAP_TILE_GRID
+    image_format = image_format or settings.MAP_IMAGE_FORMAT
+    try:
+        async with pdf_cache.leased(url) as leased_path:
+            pdf_path = str(leased_path)
+            page_count = await _run_in_pool(_page_count, pdf_path)
 
-            doc.close()
-            return base64_encoded_pngs
+            pages = await asyncio.gather(
+                *(
+                    _run_in_pool(
+                        _render_page,
+                        pdf_path,
+                        page_num,
+                        quality,
+                        max_size,
+                        sizing,
+                        tile_grid,
+                        image_format,
+                    )
+                    for page_num in range(page_count)
+                )
+            )
+        return [image for page_images in pages for image in page_images]
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code, detail=f"HTTP error occurred: {e}"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
+async def pdf_to_base64_pngs(
+    url: str, quality: int = 75, max_size: tuple = (1024, 1024)
+) -> List[str]:
+    images = await render_pdf_images(url, quality, max_size, image_format="png")
+    return [base64.b64encode(image.data).decode("utf-8") for image in images]
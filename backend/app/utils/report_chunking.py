@@ -0,0 +1,124 @@
+# app/utils/report_chunking.py
+import re
+from collections import Counter
+from typing import List
+
+# Separator between pages in text extracted from PDFs
+PAGE_BREAK = "\f"
+
+# Rough characters per token for English and Romance-language prose
+CHARS_PER_TOKEN = 4
+
+_ANNEX_HEADING = re.compile(r"^\s*(annex|appendix|annexe|anexo)\b", re.IGNORECASE)
+_SECTION_HEADING = re.compile(
+    r"\n(?=(?:\d+(?:\.\d+)*\.?\s+)?[A-Z][A-Z0-9 ,&/()'-]{3,}\n)"
+)
+_LETTERS = re.compile(r"[^\W\d_]")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+# Consecutive lines of figures from this many on are taken to be the cells of
+# a numeric table; shorter runs are kept, as key figures and dates are often
+# laid out on lines of their own
+TABLE_MIN_LINES = 6
+
+
+def _is_figures(line: str) -> bool:
+    letters = len(_LETTERS.findall(line))
+    return len(line) > 0 and letters < len(line) * 0.3
+
+
+def _drop_tables(lines: List[str]) -> List[str]:
+    kept: List[str] = []
+    run: List[str] = []
+    for line in lines + [""]:
+        if _is_figures(line):
+            run.append(line)
+            continue
+        if len(run) < TABLE_MIN_LINES:
+            kept.extend(run)
+        run = []
+        kept.append(line)
+    return kept[:-1]
+
+
+def clean_text(text: str) -> str:
+    """
+    Strip boilerplate from extracted report text, keeping page breaks.
+
+    Removes running headers and footers repeated on most pages, long runs of
+    numeric table cells, and annexes or appendices in the second half of the
+    report, and collapses whitespace. Meant for reports too large to analyze
+    in one call, as it can drop figures that belong to the content.
+    """
+    pages = [page.splitlines() for page in text.split(PAGE_BREAK)]
+
+    repeated = set()
+    if len(pages) >= 3:
+        counts = Counter(
+            line.strip() for lines in pages for line in set(lines) if line.strip()
+        )
+        repeated = {line for line, n in counts.items() if n > len(pages) / 2}
+
+    cleaned = []
+    for number, lines in enumerate(pages):
+        if (
+            number >= len(pages) / 2
+            and lines
+            and any(_ANNEX_HEADING.match(line) for line in lines[:3])
+        ):
+            break
+        kept = [
+            " ".join(line.split())
+            for line in lines
+            if line.strip() and line.strip() not in repeated
+        ]
+        cleaned.append("\n".join(_drop_tables(kept)))
+    return PAGE_BREAK.join(cleaned)
+
+
+def _split_oversized(text: str, max_chars: int) -> List[str]:
+    # Prefer section headings, then paragraphs, then a hard cut
+    for pattern in (_SECTION_HEADING, re.compile(r"\n\s*\n"), re.compile(r"\n")):
+        parts = [part for part in pattern.split(text) if part.strip()]
+        if len(parts) > 1:
+            return [piece for part in parts for piece in _pack(part, max_chars)]
+    return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def _pack(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    return _split_oversized(text, max_chars)
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split report text into chunks of at most ``max_tokens`` estimated tokens.
+
+    Whole pages are packed together while they fit; pages that are too large
+    on their own are split at section headings or paragraphs.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = [
+        piece
+        for page in text.split(PAGE_BREAK)
+        if page.strip()
+        for piece in _pack(page.strip(), max_chars)
+    ]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        if current and size + len(piece) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,153 @@
+# app/utils/response_cache.py
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in the invalidations it announces
+PROCESS_TOKEN = uuid.uuid4().hex
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized responses with a TTL.
+
+    ``invalidate`` empties the cache and bumps ``generation``; responses built
+    from data read before an invalidation are not stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, response = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: Hashable, response: CachedResponse, generation: int):
+        if generation != self.generation or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> int:
+        self.generation += 1
+        self._entries.clear()
+        return self.generation
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+async def invalidate_cached_responses():
+    """
+    Invalidate the response cache of this process and, on PostgreSQL, of
+    every other process, through a NOTIFY on CACHE_NOTIFY_CHANNEL that the
+    sync listener handles.
+    """
+    response_cache.invalidate()
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(
+                select(func.pg_notify(settings.CACHE_NOTIFY_CHANNEL, PROCESS_TOKEN))
+            )
+            await conn.commit()
+    except Exception:
+        # Other processes still drop their entries once the TTL expires
+        logger.exception("Failed to announce a response cache invalidation")
+
+
+def handle_cache_notification(payload: str):
+    # This process already invalidated its cache before announcing it
+    if payload != PROCESS_TOKEN:
+        response_cache.invalidate()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def render_json(content: Any) -> bytes:
+    # Same encoding as FastAPI's default JSONResponse
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+async def cached_response(
+    request: Request, build: Callable[[Response], Awaitable[Any]]
+) -> Response:
+    """
+    Serve a JSON response from the cache, building it on a miss.
+
+    ``build`` receives a response whose headers, such as the next-page
+    cursor, are cached along with the content it returns. The ETag is a hash
+    of the body, so it is the same across processes, and requests whose
+    If-None-Match matches get an empty 304.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    cached = response_cache.get(key)
+    if cached is None:
+        generation = response_cache.generation
+        partial = Response()
+        body = render_json(await build(partial))
+        cached = CachedResponse(
+            body,
+            f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            {
+                name: value
+                for name, value in partial.headers.items()
+                if name != "content-length"
+            },
+        )
+        response_cache.set(key, cached, generation)
+
+    headers = {
+        **cached.headers,
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,65 @@
+# app/utils/single_flight.py
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from app.db.session import AsyncSessionLocal
+from app.models.work_claim import WorkClaim
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` unless a call for ``key`` is running, and share its result."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared call so one cancelled waiter doesn't abort it for
+        # everyone else.
+        return await asyncio.shield(future)
+
+
+async def try_claim(key: str, stale_after: float) -> bool:
+    """Claim ``key`` unless a claim younger than ``stale_after`` seconds holds it."""
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        # Claims left behind by a process that died expire
+        await db.execute(
+            delete(WorkClaim).where(
+                WorkClaim.key == key,
+                WorkClaim.claimed_at < now - timedelta(seconds=stale_after),
+            )
+        )
+        db.add(WorkClaim(key=key, claimed_at=now))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        return True
+
+
+@asynccontextmanager
+async def work_claim(key: str, stale_after: float, poll_interval: float = 0.5):
+    """
+    Claim ``key`` for the duration of the block, waiting for other holders.
+
+    The claim is a row in the shared database, so it serializes work across
+    processes without holding a connection while the work runs.
+    """
+    while not await try_claim(key, stale_after):
+        await asyncio.sleep(poll_interval)
+    try:
+        yield
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(WorkClaim).where(WorkClaim.key == key))
+            await db.commit()
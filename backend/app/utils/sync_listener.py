@@ -0,0 +1,108 @@
+# app/utils/sync_listener.py
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy.engine import make_url
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models.report_image import ReportImage
+from app.models.sync_run import SyncRun
+from app.utils.disaster_summary import refresh_disaster_summary
+from app.utils.image_store import image_store
+from app.utils.response_cache import handle_cache_notification, response_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between liveness checks of an idle listening connection
+LISTEN_CHECK_SECONDS = 30
+RECONNECT_DELAY_SECONDS = 5
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+async def handle_sync_run(run_id: Optional[int]):
+    """
+    Refresh everything derived from synced data after a sync run. A run ID
+    of None stands for runs that may have been missed while not listening.
+    """
+    await refresh_disaster_summary()
+    response_cache.invalidate()
+    async with AsyncSessionLocal() as db:
+        run = await db.get(SyncRun, run_id) if run_id is not None else None
+        if run is not None and not run.deleted:
+            logger.info(f"Refreshed caches after sync run {run_id}")
+            return
+        # Images of deleted reports lose their rows with the report
+        result = await db.execute(select(ReportImage.report_id).distinct())
+        report_ids = result.scalars().all()
+    await asyncio.to_thread(
+        image_store.prune, report_ids, settings.IMAGE_PRUNE_MIN_AGE_SECONDS
+    )
+    logger.info(f"Refreshed caches and pruned images after sync run {run_id}")
+
+
+async def listen_for_sync_runs():
+    """
+    LISTEN for the sync runs datasync announces on SYNC_NOTIFY_CHANNEL, and
+    for the response cache invalidations of other processes on
+    CACHE_NOTIFY_CHANNEL.
+
+    Uses a dedicated connection rather than one from the pool, and
+    reconnects whenever it is lost.
+    """
+    import asyncpg
+
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+            queue: asyncio.Queue = asyncio.Queue()
+            await conn.add_listener(
+                settings.SYNC_NOTIFY_CHANNEL,
+                lambda _conn, _pid, _channel, payload: queue.put_nowait(payload),
+            )
+            await conn.add_listener(
+                settings.CACHE_NOTIFY_CHANNEL,
+                lambda _conn, _pid, _channel, payload: handle_cache_notification(
+                    payload
+                ),
+            )
+            await handle_sync_run(None)
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), LISTEN_CHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    # Raises if the connection has silently gone away
+                    await conn.execute("SELECT 1")
+                    continue
+                try:
+                    await handle_sync_run(int(payload))
+                except Exception:
+                    logger.exception(f"Failed to handle sync run {payload}")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Sync listener connection failed; reconnecting")
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+
+def start_sync_listener():
+    global _listener_task
+    # NOTIFY is PostgreSQL-only; elsewhere caches expire on their TTL
+    if engine.dialect.name != "postgresql":
+        return
+    _listener_task = asyncio.create_task(listen_for_sync_runs())
+
+
+async def stop_sync_listener():
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    await asyncio.gather(_listener_task, return_exceptions=True)
+    _listener_task = None
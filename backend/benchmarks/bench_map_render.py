@@ -0,0 +1,69 @@
+"""
+Compare time per page and peak memory of rendering map pages at 300 DPI and
+downscaling ("dpi") with rendering straight at the target size ("fit").
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_map_render [--pages 4] [--pdf PATH]
+
+Without --pdf a synthetic A0 map is generated. Each mode renders every page
+in a fresh worker process, whose peak RSS is reported.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("ANTHROPIC_API_KEY", "unused")
+
+from app.utils.pdf_extractor import _page_count, _render_page
+from benchmarks.sample_pdf import write_map_pdf
+
+
+def render_all(pdf_path: str, sizing: str, max_size: tuple, tile_grid: int):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    page_count = _page_count(pdf_path)
+    for page_num in range(page_count):
+        _render_page(pdf_path, page_num, 75, max_size, sizing, tile_grid, "png")
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return page_count, elapsed, baseline / scale, peak / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark map page rendering")
+    parser.add_argument("--pdf")
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--max-size", type=int, default=1024)
+    parser.add_argument("--tile-grid", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = args.pdf or write_map_pdf(
+            os.path.join(directory, "map.pdf"), args.pages
+        )
+        max_size = (args.max_size, args.max_size)
+        for sizing in ("dpi", "fit"):
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                pages, elapsed, baseline, peak = pool.submit(
+                    render_all, pdf_path, sizing, max_size, args.tile_grid
+                ).result()
+            print(
+                f"{sizing:>4}: {elapsed / pages * 1000:7.0f} ms/page, "
+                f"peak RSS {peak:6.0f} MiB ({peak - baseline:+.0f} MiB over idle)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Measure pages/sec of PDF text extraction and map rendering in the process
+pool for several worker counts, against running inline on the event loop
+as before the pool was introduced. The longest stall of the event loop is
+reported alongside, since that is what delays every other request.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pdf_pool [--pages 8] [--workers 1 2 4] [--pdf PATH]
+
+Without --pdf a synthetic multi-page A0 map is generated.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("ANTHROPIC_API_KEY", "unused")
+
+from app.core.config import settings
+from app.utils import pdf_extractor
+from app.utils.pdf_extractor import (
+    _extract_text,
+    _page_count,
+    _render_page,
+    _run_in_pool,
+)
+from benchmarks.sample_pdf import write_map_pdf
+
+MAX_SIZE = (1024, 1024)
+
+
+def render_args(pdf_path: str, page_num: int):
+    return pdf_path, page_num, 75, MAX_SIZE, "fit", 1, "png"
+
+
+async def inline(pdf_path: str, page_count: int):
+    started = time.perf_counter()
+    _extract_text(pdf_path, 0, page_count)
+    text = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for page_num in range(page_count):
+        _render_page(*render_args(pdf_path, page_num))
+    return text, time.perf_counter() - started
+
+
+async def pooled(pdf_path: str, page_count: int):
+    # Start the workers before timing, as a running server would have them
+    await asyncio.gather(
+        *(
+            _run_in_pool(_page_count, pdf_path)
+            for _ in range(pdf_extractor.pdf_worker_count())
+        )
+    )
+    step = max(1, -(-page_count // pdf_extractor.pdf_worker_count()))
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _run_in_pool(_extract_text, pdf_path, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        )
+    )
+    text = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _run_in_pool(_render_page, *render_args(pdf_path, page_num))
+            for page_num in range(page_count)
+        )
+    )
+    return text, time.perf_counter() - started
+
+
+async def max_loop_lag(stop: asyncio.Event) -> float:
+    # How late a 10 ms timer fires, i.e. how long requests would be stalled
+    lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lag = max(lag, time.perf_counter() - started - 0.01)
+    return lag
+
+
+async def run(pdf_path: str, workers):
+    page_count = _page_count(pdf_path)
+    runs = [("inline", None, inline)] + [
+        (f"{count} workers", count, pooled) for count in workers
+    ]
+    for name, count, measure in runs:
+        settings.PDF_WORKERS = count
+        stop = asyncio.Event()
+        probe = asyncio.create_task(max_loop_lag(stop))
+        await asyncio.sleep(0)
+        text, render = await measure(pdf_path, page_count)
+        stop.set()
+        lag = await probe
+        pdf_extractor.shutdown_pdf_executor()
+        print(
+            f"{name:>10}: text {page_count / text:8.1f} pages/s, "
+            f"render {page_count / render:6.2f} pages/s, "
+            f"event loop stalled up to {lag * 1000:6.0f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF process pool")
+    parser.add_argument("--pdf")
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = args.pdf or write_map_pdf(
+            os.path.join(directory, "map.pdf"), args.pages
+        )
+        asyncio.run(run(pdf_path, sorted(set(args.workers))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Measure /api/v1/reports/?limit=100 with realistic extracted data, loading
+full report rows as before column deferral against the list columns only.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_report_list [--reports 500] [--text-kb 200]
+
+Reports are written to a temporary SQLite database. Set DATABASE_URL to a
+PostgreSQL database with a migrated schema to measure against it instead;
+the benchmark adds and removes its own rows.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp.name}/bench.db")
+os.environ.setdefault("ANTHROPIC_API_KEY", "unused")
+
+import httpx
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.orm import undefer_group
+
+from app.db.base import Base
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.models.disaster import Disaster
+from app.models.report import Report
+from app.schemas.report import ReportList
+
+FIRST_ID = 10_000_000
+
+
+async def seed(count: int, text_kb: int):
+    async with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            await conn.run_sync(Base.metadata.create_all)
+    now = datetime.now(timezone.utc)
+    text = ("Situation overview and humanitarian needs. " * 24 * text_kb)[
+        : text_kb * 1024
+    ]
+    maps = [
+        {
+            "page": page,
+            "url": f"/api/v1/reports/1/maps/{page}",
+            "media_type": "image/png",
+            "width": 1024,
+            "height": 724,
+        }
+        for page in range(20)
+    ]
+    async with AsyncSessionLocal() as db:
+        db.add(Disaster(id=FIRST_ID, name="Benchmark flood", date_changed=now))
+        for report_id in range(FIRST_ID, FIRST_ID + count):
+            db.add(
+                Report(
+                    id=report_id,
+                    disaster_id=FIRST_ID,
+                    title=f"Situation report {report_id}",
+                    status="published",
+                    body=text,
+                    extracted_report=text,
+                    extracted_maps=maps,
+                    date_original=now,
+                    date_changed=now - timedelta(minutes=report_id - FIRST_ID),
+                    content_format_id=10,
+                    content_format_name="Situation Report",
+                )
+            )
+        await db.commit()
+
+
+async def full_rows(limit: int):
+    # The list query before deferral, serialized the same way
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Report)
+            .options(undefer_group("content"))
+            .order_by(desc(Report.date_changed))
+            .limit(limit)
+        )
+        reports = result.scalars().all()
+        return [ReportList.model_validate(report).model_dump() for report in reports]
+
+
+async def timed(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def run(count: int, text_kb: int, runs: int):
+    await seed(count, text_kb)
+    try:
+        async with AsyncSessionLocal() as db:
+            row_bytes = await db.scalar(
+                select(
+                    func.sum(
+                        func.length(Report.body) + func.length(Report.extracted_report)
+                    )
+                ).where(Report.id >= FIRST_ID)
+            )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            response = await client.get("/api/v1/reports/", params={"limit": 100})
+            response.raise_for_status()
+
+            async def list_columns():
+                await client.get("/api/v1/reports/", params={"limit": 100})
+
+            deferred_ms = await timed(list_columns, runs)
+        full_ms = await timed(lambda: full_rows(100), runs)
+
+        print(f"response size: {len(response.content) / 1024:.1f} KiB for 100 reports")
+        print(
+            f"   full rows: {full_ms:7.1f} ms, "
+            f"~{row_bytes / count * 100 / 1024 / 1024:.1f} MiB of text read"
+        )
+        print(f"list columns: {deferred_ms:7.1f} ms (whole request)")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Report).where(Report.id >= FIRST_ID))
+            await db.execute(delete(Disaster).where(Disaster.id == FIRST_ID))
+            await db.commit()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report listing")
+    parser.add_argument("--reports", type=int, default=500)
+    parser.add_argument("--text-kb", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.reports, args.text_kb, args.runs))
+
+
+if __name__ == "__main__":
+    main()
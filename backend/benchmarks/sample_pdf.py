@@ -0,0 +1,31 @@
+# benchmarks/sample_pdf.py
+import fitz  # PyMuPDF
+
+# ISO A0 in points, the size of a typical wall map
+A0 = (2384, 3370)
+
+
+def write_map_pdf(path: str, pages: int = 4, size: tuple = A0) -> str:
+    """Write a vector-heavy map-like PDF with ``pages`` pages to ``path``."""
+    width, height = size
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page(width=width, height=height)
+        shape = page.new_shape()
+        for row in range(0, int(height), 40):
+            for col in range(0, int(width), 40):
+                shade = ((row + col + page_num * 7) % 255) / 255
+                shape.draw_rect(fitz.Rect(col, row, col + 36, row + 36))
+                shape.finish(
+                    color=(shade, 0.4, 1 - shade), fill=(1 - shade, shade, 0.5)
+                )
+        shape.commit()
+        for line in range(0, int(height), 120):
+            page.insert_text(
+                (60, line + 60),
+                f"District {page_num}-{line} - affected population 12,450",
+                fontsize=24,
+            )
+    doc.save(path)
+    doc.close()
+    return path
@@ -0,0 +1,88 @@
+"""Initial schema
+
+The disaster and report tables as previously created by
+Base.metadata.create_all. Databases that already have them are left as they
+are, so existing deployments can adopt migrations with a plain upgrade.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if "disaster" not in tables:
+        op.create_table(
+            "disaster",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String()),
+            sa.Column("description", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("glide", sa.String()),
+            sa.Column("url", sa.String()),
+            sa.Column("url_alias", sa.String()),
+            sa.Column("date_created", sa.DateTime(timezone=True)),
+            sa.Column("date_changed", sa.DateTime(timezone=True)),
+            sa.Column("date_event", sa.DateTime(timezone=True)),
+            sa.Column("primary_country", sa.JSON()),
+            sa.Column("affected_countries", sa.JSON()),
+            sa.Column("primary_type", sa.JSON()),
+            sa.Column("related_glide", sa.JSON()),
+            sa.Column("report_analysis", sa.JSON()),
+            sa.Column("map_analysis", sa.JSON()),
+            sa.Column("news_analysis", sa.JSON()),
+        )
+        for column in ("id", "name", "status", "glide", "date_event"):
+            op.create_index(f"ix_disaster_{column}", "disaster", [column])
+
+    if "report" not in tables:
+        op.create_table(
+            "report",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("disaster_id", sa.Integer(), sa.ForeignKey("disaster.id")),
+            sa.Column("title", sa.String()),
+            sa.Column("body", sa.String()),
+            sa.Column("url", sa.String()),
+            sa.Column("url_alias", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("date_created", sa.DateTime(timezone=True)),
+            sa.Column("date_changed", sa.DateTime(timezone=True)),
+            sa.Column("date_original", sa.DateTime(timezone=True)),
+            sa.Column("primary_country", sa.JSON()),
+            sa.Column("affected_countries", sa.JSON()),
+            sa.Column("language", sa.JSON()),
+            sa.Column("source", sa.JSON()),
+            sa.Column("theme", sa.JSON()),
+            sa.Column("file", sa.JSON()),
+            sa.Column("extracted_report", sa.Text()),
+            sa.Column("extracted_maps", sa.JSON()),
+            sa.Column("content_format_id", sa.Integer()),
+            sa.Column("content_format_name", sa.String()),
+        )
+        for column in (
+            "id",
+            "disaster_id",
+            "title",
+            "status",
+            "date_created",
+            "content_format_id",
+            "content_format_name",
+        ):
+            op.create_index(f"ix_report_{column}", "report", [column])
+
+
+def downgrade() -> None:
+    op.drop_table("report")
+    op.drop_table("disaster")
@@ -0,0 +1,108 @@
+"""Content hashes, sync state, report images and composite indexes
+
+The composite indexes match the hot query shapes:
+
+- latest report of a format for a disaster: filter on disaster_id and
+  content_format_id, order by date_created desc, limit 1
+- listing endpoints: order by (date_changed, id) desc, optionally per disaster
+
+They are built concurrently on PostgreSQL so the tables stay writable while
+the indexes are created.
+
+Until migrations were introduced the schema was created with
+Base.metadata.create_all, which creates missing tables but never alters
+existing ones. Depending on when a database was created it may already have
+some of these tables, columns and indexes, so only the missing ones are added.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    (
+        "ix_report_disaster_id_content_format_id_date_created",
+        "report",
+        ["disaster_id", "content_format_id", "date_created"],
+    ),
+    ("ix_report_date_changed_id", "report", ["date_changed", "id"]),
+    (
+        "ix_report_disaster_id_date_changed_id",
+        "report",
+        ["disaster_id", "date_changed", "id"],
+    ),
+    ("ix_disaster_date_changed_id", "disaster", ["date_changed", "id"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    for table in ("disaster", "report"):
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "content_hash" not in columns:
+            op.add_column(table, sa.Column("content_hash", sa.String(64)))
+
+    if "syncstate" not in tables:
+        op.create_table(
+            "syncstate",
+            sa.Column("key", sa.String(), primary_key=True),
+            sa.Column("watermark", sa.DateTime(timezone=True)),
+        )
+
+    if "reportimage" not in tables:
+        op.create_table(
+            "reportimage",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "report_id",
+                sa.Integer(),
+                sa.ForeignKey("report.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("page", sa.Integer(), nullable=False),
+            sa.Column("media_type", sa.String(), nullable=False),
+            sa.Column("width", sa.Integer()),
+            sa.Column("height", sa.Integer()),
+            sa.Column("size", sa.Integer()),
+            sa.Column("sha256", sa.String(64)),
+            sa.Column("path", sa.String(), nullable=False),
+            sa.Column(
+                "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+            ),
+            sa.UniqueConstraint("report_id", "page"),
+        )
+        op.create_index("ix_reportimage_id", "reportimage", ["id"])
+        op.create_index("ix_reportimage_report_id", "reportimage", ["report_id"])
+
+    existing_indexes = {
+        index["name"]
+        for table in ("disaster", "report")
+        for index in inspector.get_indexes(table)
+    }
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name not in existing_indexes:
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_table("reportimage")
+    op.drop_table("syncstate")
+    op.drop_column("report", "content_hash")
+    op.drop_column("disaster", "content_hash")
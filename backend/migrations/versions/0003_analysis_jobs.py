@@ -0,0 +1,57 @@
+"""Analysis job queue
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('queued', 'running')")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysisjob",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "disaster_id",
+            sa.Integer(),
+            sa.ForeignKey("disaster.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("analysis_type", sa.String(), nullable=False),
+        sa.Column("lang", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text()),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_analysisjob_id", "analysisjob", ["id"])
+    op.create_index(
+        "ix_analysisjob_status_created_at", "analysisjob", ["status", "created_at"]
+    )
+    op.create_index(
+        "ix_analysisjob_active",
+        "analysisjob",
+        ["disaster_id", "analysis_type", "lang"],
+        unique=True,
+        postgresql_where=ACTIVE,
+        sqlite_where=ACTIVE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analysisjob")
@@ -0,0 +1,51 @@
+"""Per-language analysis cache
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "disaster_id",
+            sa.Integer(),
+            sa.ForeignKey("disaster.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("analysis_type", sa.String(), nullable=False),
+        sa.Column("lang", sa.String(), nullable=False),
+        sa.Column(
+            "source_report_id",
+            sa.Integer(),
+            sa.ForeignKey("report.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.UniqueConstraint("disaster_id", "analysis_type", "lang", "source_report_id"),
+    )
+    op.create_index("ix_analysis_id", "analysis", ["id"])
+    op.create_index("ix_analysis_source_report_id", "analysis", ["source_report_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("analysis")
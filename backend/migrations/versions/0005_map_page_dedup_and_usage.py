@@ -0,0 +1,39 @@
+"""Map page hashes, page description cache and analysis usage
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("reportimage", sa.Column("phash", sa.String(64)))
+    op.add_column("analysis", sa.Column("usage", sa.JSON()))
+    op.create_table(
+        "mappagedescription",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.UniqueConstraint("sha256", "model"),
+    )
+    op.create_index("ix_mappagedescription_id", "mappagedescription", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("mappagedescription")
+    op.drop_column("analysis", "usage")
+    op.drop_column("reportimage", "phash")
@@ -0,0 +1,88 @@
+"""Disaster summary view
+
+A compact row per disaster for the dashboard list: report counts per
+content format, the latest report date and the number of people affected
+from the English report analysis. On PostgreSQL it is a materialized view,
+refreshed concurrently after each sync and report analysis; the unique
+index on id is what allows concurrent refreshes. Elsewhere it is a plain
+view.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+"""
+
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ReliefWeb content format IDs, fixed here so the view does not change with the
+# settings of the process that runs the migration
+SITUATION_REPORT_FORMAT = 10
+MAP_FORMAT = 12
+NEWS_FORMAT = 8
+
+AFFECTED_PEOPLE = {
+    "postgresql": """CASE WHEN json_typeof(d.report_analysis -> 'analysis' -> 'impact_analysis' -> 'affected_people') = 'number'
+        THEN (d.report_analysis -> 'analysis' -> 'impact_analysis' ->> 'affected_people')::numeric::bigint END""",
+    "sqlite": """CASE WHEN json_type(d.report_analysis, '$.analysis.impact_analysis.affected_people') IN ('integer', 'real')
+        THEN CAST(json_extract(d.report_analysis, '$.analysis.impact_analysis.affected_people') AS INTEGER) END""",
+}
+
+
+def summary_query(dialect: str) -> str:
+    return f"""
+    SELECT
+        d.id,
+        d.name,
+        d.status,
+        d.date_event,
+        d.date_changed,
+        d.primary_country,
+        d.primary_type,
+        COALESCE(r.situation_report_count, 0) AS situation_report_count,
+        COALESCE(r.map_count, 0) AS map_count,
+        COALESCE(r.news_count, 0) AS news_count,
+        r.latest_report_date,
+        {AFFECTED_PEOPLE[dialect]} AS affected_people
+    FROM disaster d
+    LEFT JOIN (
+        SELECT
+            disaster_id,
+            SUM(CASE WHEN content_format_id = {SITUATION_REPORT_FORMAT} THEN 1 ELSE 0 END) AS situation_report_count,
+            SUM(CASE WHEN content_format_id = {MAP_FORMAT} THEN 1 ELSE 0 END) AS map_count,
+            SUM(CASE WHEN content_format_id = {NEWS_FORMAT} THEN 1 ELSE 0 END) AS news_count,
+            MAX(date_created) AS latest_report_date
+        FROM report
+        GROUP BY disaster_id
+    ) r ON r.disaster_id = d.id
+    """
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            f"CREATE MATERIALIZED VIEW disaster_summary AS {summary_query(dialect)}"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX ix_disaster_summary_id ON disaster_summary (id)"
+        )
+        op.execute(
+            "CREATE INDEX ix_disaster_summary_date_changed_id "
+            "ON disaster_summary (date_changed, id)"
+        )
+    else:
+        op.execute(f"CREATE VIEW disaster_summary AS {summary_query(dialect)}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP MATERIALIZED VIEW disaster_summary")
+    else:
+        op.execute("DROP VIEW disaster_summary")
@@ -0,0 +1,74 @@
+"""Required change dates
+
+Listings page through disasters and reports by (date_changed, id), so rows
+without a change date would fall out of cursor pagination. Missing dates
+are filled from the creation date, or the Unix epoch, and the columns made
+NOT NULL.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("disaster", "report")
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def set_date_changed_nullable(nullable: bool) -> None:
+    bind = op.get_bind()
+    views = []
+    if bind.dialect.name == "sqlite":
+        # SQLite rebuilds the tables to change a constraint, which fails while
+        # a view refers to them
+        views = bind.execute(
+            sa.text("SELECT name, sql FROM sqlite_master WHERE type = 'view'")
+        ).all()
+        for name, _ in views:
+            op.execute(f"DROP VIEW {name}")
+
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                "date_changed",
+                existing_type=sa.DateTime(timezone=True),
+                nullable=nullable,
+            )
+
+    for _, sql in views:
+        op.execute(sql)
+
+
+def upgrade() -> None:
+    for name in TABLES:
+        table = sa.table(
+            name,
+            sa.column("date_created", sa.DateTime(timezone=True)),
+            sa.column("date_changed", sa.DateTime(timezone=True)),
+        )
+        op.execute(
+            table.update()
+            .where(table.c.date_changed.is_(None))
+            .values(
+                date_changed=sa.func.coalesce(
+                    table.c.date_created,
+                    sa.literal(EPOCH, sa.DateTime(timezone=True)),
+                )
+            )
+        )
+    set_date_changed_nullable(False)
+
+
+def downgrade() -> None:
+    set_date_changed_nullable(True)
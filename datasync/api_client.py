@@ -1,37 +1,347 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import httpx
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    A token-bucket rate limiter shared by all requests of a client.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the token bucket.
+
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens, i.e. the allowed burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Wait until a token is available and take it.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Pauses callers after repeated upstream failures instead of letting them
+    keep hammering a failing service.
+
+    Once the reset timeout has passed the circuit is half-open: a single
+    trial request is let through while the other callers keep waiting for
+    its outcome, which either closes the circuit or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Initialize the circuit breaker.
+
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds to stay open before allowing a trial request.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._trial_done = asyncio.Event()
+
+    async def wait(self) -> bool:
+        """
+        Wait until the circuit allows requests again.
+
+        :return: Whether the caller was let through as the half-open trial
+            request, and must report its outcome with ``trial=True``.
+        """
+        while self.opened_at is not None:
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                logger.warning(f"Circuit open, pausing requests for {remaining:.0f}s")
+                await asyncio.sleep(remaining)
+            elif not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            else:
+                await self._trial_done.wait()
+        return False
+
+    def record_success(self, trial: bool = False):
+        """
+        Close the circuit after a successful request.
+
+        :param trial: Whether the request was the half-open trial.
+        """
+        self.failures = 0
+        self.opened_at = None
+        if trial:
+            self.end_trial()
+
+    def record_failure(self, trial: bool = False) -> bool:
+        """
+        Count a failed request, opening the circuit at the threshold.
+
+        :param trial: Whether the request was the half-open trial, which
+            opens the circuit again regardless of the threshold.
+        :return: Whether this failure (re)opened the circuit.
+        """
+        self.failures += 1
+        opened = trial or self.failures >= self.failure_threshold
+        if opened:
+            self.opened_at = time.monotonic()
+        if trial:
+            self.end_trial()
+        return opened
+
+    def end_trial(self):
+        """
+        Wake the callers waiting for the outcome of the half-open trial.
+        """
+        self._trial_in_flight = False
+        self._trial_done.set()
+        self._trial_done = asyncio.Event()
+
 
 class APIClient:
     """
     A client for making asynchronous HTTP requests to a specified base URL.
+
+    Requests are rate limited, retried with exponential backoff and jitter,
+    and paused by a circuit breaker when the upstream keeps failing.
     """
 
-    def __init__(self, base_url: str, app_name: str):
+    def __init__(
+        self,
+        base_url: str,
+        app_name: str,
+        requests_per_minute: float = 60,
+        burst: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        max_backoff: float = 60.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 300.0,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: bool = False,
+    ):
         """
         Initialize the API client.
 
         :param base_url: The base URL for the API.
         :param app_name: The application name to be used in the API requests.
+        :param requests_per_minute: The sustained request rate allowed.
+        :param burst: The number of requests allowed back to back.
+        :param max_retries: The number of retries for a failed request.
+        :param backoff_base: The base delay in seconds for exponential backoff.
+        :param max_backoff: The maximum delay in seconds between retries.
+        :param failure_threshold: Consecutive failures that open the circuit.
+        :param reset_timeout: Seconds the circuit stays open.
+        :param limits: Connection pool size and keep-alive settings.
+        :param timeout: Connect, read, write and pool timeouts.
+        :param http2: Whether to negotiate HTTP/2 and multiplex requests.
         """
         self.base_url = base_url
         self.app_name = app_name
-        self.client = httpx.AsyncClient()
+        self.client = httpx.AsyncClient(
+            limits=limits or httpx.Limits(),
+            timeout=timeout or httpx.Timeout(5.0),
+            http2=http2,
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.rate_limiter = TokenBucket(requests_per_minute / 60, burst)
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.reset_stats()
 
     async def post(self, endpoint: str, json: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Make a POST request to the specified endpoint.
 
+        Rate-limit responses, server errors and transport errors are retried;
+        other client errors are raised immediately.
+
         :param endpoint: The API endpoint to post to.
         :param json: The JSON payload to send with the request.
         :return: The JSON response from the API.
         """
         url = f"{self.base_url}/{endpoint}?appname={self.app_name}"
-        response = await self.client.post(url, json=json)
-        response.raise_for_status()
-        return response.json()
+        for attempt in range(self.max_retries + 1):
+            trial = await self.circuit_breaker.wait()
+            retry_after = None
+            try:
+                await self.rate_limiter.acquire()
+                started = time.monotonic()
+                self._stats["requests"] += 1
+                response = await self.client.post(url, json=json)
+                self._record_latency(time.monotonic() - started)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    self.circuit_breaker.record_success(trial)
+                    return response.json()
+                if response.status_code == 429:
+                    self._stats["rate_limited"] += 1
+                retry_after = self.parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    # The upstream is answering, it only rejected this request
+                    self.circuit_breaker.record_success(trial)
+                    self._stats["failures"] += 1
+                    raise
+                error = e
+            except httpx.TransportError as e:
+                self._record_latency(time.monotonic() - started)
+                error = e
+            except BaseException:
+                # Cancelled or unexpected: let another caller run the trial
+                if trial:
+                    self.circuit_breaker.end_trial()
+                raise
+
+            if self.circuit_breaker.record_failure(trial):
+                self._stats["circuit_opens"] += 1
+            if attempt == self.max_retries:
+                self._stats["failures"] += 1
+                raise error
+
+            delay = self.backoff_delay(attempt, retry_after)
+            self._stats["retries"] += 1
+            logger.warning(
+                f"Request to {endpoint} failed ({error!r}), "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+            )
+            await asyncio.sleep(delay)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next retry.
+
+        :param attempt: The zero-based number of the attempt that failed.
+        :param retry_after: The delay requested by the server, if any.
+        :return: The delay in seconds. The backoff itself is capped at the
+            maximum backoff, but a longer Retry-After is always honored.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_base * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header given in seconds or as an HTTP date.
+
+        :param value: The header value.
+        :return: The delay in seconds, if the header is present and valid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _record_latency(self, latency: float):
+        self._stats["latency_total"] += latency
+        self._stats["latency_max"] = max(self._stats["latency_max"], latency)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Request, retry and latency counters since the last reset.
+        """
+        stats = dict(self._stats)
+        stats["latency_avg"] = (
+            stats["latency_total"] / stats["requests"] if stats["requests"] else 0.0
+        )
+        return stats
+
+    def reset_stats(self):
+        """
+        Reset the request counters.
+        """
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "rate_limited": 0,
+            "circuit_opens": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+        }
+
+    async def paginate(
+        self,
+        endpoint: str,
+        json: Dict[str, Any] = None,
+        page_size: int = 100,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk a paginated endpoint page by page using offset/limit.
+
+        Only one page is held in memory at a time.
+
+        :param endpoint: The API endpoint to post to.
+        :param json: The JSON payload to send with every page request.
+        :param page_size: The number of items to request per page.
+        :param max_items: The maximum number of items to return in total.
+        :return: An async iterator over the items of each page.
+        """
+        offset = 0
+        while True:
+            limit = page_size
+            if max_items is not None:
+                limit = min(page_size, max_items - offset)
+            if limit <= 0:
+                return
+
+            data = await self.post(
+                endpoint, {**(json or {}), "offset": offset, "limit": limit}
+            )
+            items = data.get("data", [])
+            if items:
+                yield items
+
+            offset += len(items)
+            if len(items) < limit or offset >= data.get("totalCount", offset):
+                return
 
     async def close(self):
         """
         Close the HTTP client.
         """
-        await self.client.aclose()
\ No newline at end of file
+        await self.client.aclose()
@@ -0,0 +1,133 @@
+"""
+Measure APIClient request throughput against a local mock ReliefWeb server
+at different concurrency levels, with and without connection reuse.
+
+Run from the datasync directory:
+
+    python -m benchmarks.bench_api_client [--requests 400]
+
+The mock server answers every POST after --latency-ms and charges
+--handshake-ms once per new connection to stand in for the TCP and TLS
+handshakes of the real API. It speaks HTTP/1.1 only, so HTTP/2 multiplexing
+is not measured here.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("RELIEFWEB_APP_NAME", "disasterpulse-bench")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("API_BASE_URL", "http://localhost")
+os.environ.setdefault("SYNC_INTERVAL_HOURS", "1")
+
+import httpx
+
+from api_client import APIClient
+from config import settings
+
+PAYLOAD = json.dumps(
+    {"totalCount": 1, "data": [{"id": 1, "fields": {"id": 1, "name": "Flood"}}]}
+).encode()
+
+
+class MockReliefWeb:
+    """
+    A minimal keep-alive HTTP/1.1 server returning a fixed disaster listing.
+    """
+
+    def __init__(self, latency: float, handshake: float):
+        self.latency = latency
+        self.handshake = handshake
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = dict(
+                    line.split(": ", 1)
+                    for line in head.decode("latin-1").split("\r\n")[1:]
+                    if ": " in line
+                )
+                lowered = {key.lower(): value for key, value in headers.items()}
+                await reader.readexactly(int(lowered.get("content-length", 0)))
+                await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(PAYLOAD)}\r\n\r\n".encode()
+                    + PAYLOAD
+                )
+                await writer.drain()
+                if lowered.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def measure(base_url: str, limits: httpx.Limits, concurrency: int, total: int):
+    client = APIClient(
+        base_url,
+        "bench",
+        requests_per_minute=10**9,
+        burst=10**6,
+        limits=limits,
+        timeout=httpx.Timeout(30.0),
+    )
+    queue = iter(range(total))
+
+    async def worker():
+        for _ in queue:
+            await client.post("disasters", {"limit": 1})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return total / elapsed
+
+
+async def run(args):
+    server = MockReliefWeb(args.latency_ms / 1000, args.handshake_ms / 1000)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+    base_url = f"http://{host}:{port}"
+
+    configurations = {
+        "new connection": httpx.Limits(max_keepalive_connections=0),
+        "pooled": httpx.Limits(
+            max_connections=settings.RELIEFWEB_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.RELIEFWEB_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.RELIEFWEB_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+    print(f"{'concurrency':>11} " + " ".join(f"{n:>16}" for n in configurations))
+    for concurrency in args.concurrency:
+        rates = []
+        for limits in configurations.values():
+            server.connections = 0
+            rate = await measure(base_url, limits, concurrency, args.requests)
+            rates.append(f"{rate:7.0f} req/s {server.connections:3d}c")
+        print(f"{concurrency:>11} " + " ".join(f"{rate:>16}" for rate in rates))
+
+    listener.close()
+    await listener.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark APIClient throughput")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare writing a sync batch of reports row by row (select, then add or
+update each row) with a single bulk upsert statement.
+
+Run from the datasync directory:
+
+    python -m benchmarks.bench_upsert [--rows 2000] [--database-url URL]
+
+The database URL defaults to a temporary SQLite file; pass a PostgreSQL URL
+to measure against the production dialect.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("RELIEFWEB_APP_NAME", "disasterpulse-bench")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("API_BASE_URL", "http://localhost")
+os.environ.setdefault("SYNC_INTERVAL_HOURS", "1")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.upsert import bulk_upsert
+from models.base import Base
+from models.disaster import Disaster
+from models.report import Report
+
+
+def report_rows(count: int, revision: int):
+    return [
+        {
+            "id": report_id,
+            "disaster_id": 1,
+            "title": f"Situation report {report_id} rev {revision}",
+            "body": "x" * 2000,
+            "status": "published",
+            "date_changed": datetime(2024, 7, 1),
+            "content_format_id": 10,
+            "content_hash": f"{report_id}-{revision}",
+        }
+        for report_id in range(1, count + 1)
+    ]
+
+
+async def write_row_by_row(session: AsyncSession, rows):
+    for row in rows:
+        report = await session.get(Report, row["id"])
+        if report:
+            for key, value in row.items():
+                setattr(report, key, value)
+        else:
+            session.add(Report(**row))
+
+
+async def timed(session_factory, write, rows) -> float:
+    async with session_factory() as session:
+        started = time.perf_counter()
+        async with session.begin():
+            await write(session, rows)
+        return time.perf_counter() - started
+
+
+async def run(database_url: str, count: int):
+    engine = create_async_engine(database_url)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def bulk(session, rows):
+        await bulk_upsert(session, Report, rows)
+
+    for name, write in (("row by row", write_row_by_row), ("bulk upsert", bulk)):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            async with session.begin():
+                session.add(
+                    Disaster(id=1, name="Flood", date_changed=datetime(2024, 7, 1))
+                )
+
+        insert = await timed(session_factory, write, report_rows(count, 1))
+        update = await timed(session_factory, write, report_rows(count, 2))
+        unchanged = await timed(session_factory, write, report_rows(count, 2))
+        print(
+            f"{name:>12}: insert {insert * 1000:7.1f} ms, "
+            f"update {update * 1000:7.1f} ms, unchanged {unchanged * 1000:7.1f} ms"
+        )
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report upserts")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{directory}/bench.db"
+        asyncio.run(run(database_url, args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -9,8 +10,31 @@ class Settings(BaseSettings):
     CONTENT_FORMAT_NEWS: int = 8
     API_BASE_URL: str
     DISASTER_LIMIT: int = 4
+    REPORT_LIMIT: Optional[int] = None
+    RELIEFWEB_PAGE_SIZE: int = 100
+    RELIEFWEB_REQUESTS_PER_MINUTE: float = 60
+    RELIEFWEB_BURST: int = 10
+    RELIEFWEB_MAX_RETRIES: int = 4
+    RELIEFWEB_BACKOFF_BASE_SECONDS: float = 1.0
+    RELIEFWEB_MAX_BACKOFF_SECONDS: float = 60.0
+    RELIEFWEB_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    RELIEFWEB_CIRCUIT_RESET_SECONDS: float = 300.0
+    RELIEFWEB_HTTP2: bool = True
+    RELIEFWEB_MAX_CONNECTIONS: int = 10
+    RELIEFWEB_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    RELIEFWEB_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    RELIEFWEB_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    RELIEFWEB_READ_TIMEOUT_SECONDS: float = 60.0
+    RELIEFWEB_WRITE_TIMEOUT_SECONDS: float = 10.0
+    RELIEFWEB_POOL_TIMEOUT_SECONDS: float = 30.0
+    SYNC_CONCURRENCY: int = 4
+    INCREMENTAL_SYNC: bool = True
+    FULL_REPORT_SYNC_HOURS: float = 24
+    ANALYSIS_CONCURRENCY: int = 3
+    ANALYSIS_TIMEOUT_SECONDS: float = 30.0
     SYNC_INTERVAL_HOURS: int
-    ANTHROPIC_API_KEY: str
+    SYNC_NOTIFY_CHANNEL: str = "disasterpulse_sync"
+    ANTHROPIC_API_KEY: Optional[str] = None
     RELIEF_WEB_API_URL: str = "https://api.reliefweb.int/v1"
     RETENTION_PERIOD_DAYS: int = 30
 
@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Set
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_insert_by_dialect = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Bind parameters allowed in one statement: the wire protocol limit of
+# asyncpg, and the default of SQLite builds before 3.32
+MAX_BIND_PARAMETERS = {
+    "postgresql": 32767,
+    "sqlite": 999,
+}
+
+
+def _batches(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def bulk_upsert(
+    session: AsyncSession, model, rows: List[Dict[str, Any]]
+) -> Set[Any]:
+    """
+    Insert or update rows with as few statements as the database allows.
+
+    Uses ``INSERT ... ON CONFLICT (pk) DO UPDATE`` on PostgreSQL, and the
+    equivalent SQLite syntax so the same code path works against a local
+    SQLite database. Rows are sent in batches that stay within the dialect's
+    bind parameter limit. For tables with a ``content_hash`` column, rows
+    whose stored hash matches the new one are left untouched.
+
+    :param session: The database session.
+    :param model: The ORM model whose table receives the rows.
+    :param rows: The column values for each row, keyed by column name.
+    :return: The primary keys of the rows that were inserted or updated.
+    """
+    if not rows:
+        return set()
+
+    dialect = session.bind.dialect.name
+    insert = _insert_by_dialect.get(dialect)
+    if insert is None:
+        raise NotImplementedError(f"Bulk upsert is not supported for {dialect}")
+
+    table = model.__table__
+    primary_keys = [column.name for column in table.primary_key.columns]
+    batch_size = max(1, MAX_BIND_PARAMETERS[dialect] // len(rows[0]))
+    written = set()
+    for batch in _batches(rows, batch_size):
+        stmt = insert(table).values(batch)
+        update_columns = {
+            name: stmt.excluded[name] for name in batch[0] if name not in primary_keys
+        }
+        where = None
+        if "content_hash" in table.c:
+            where = table.c.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=primary_keys, set_=update_columns, where=where
+        ).returning(*table.primary_key.columns)
+        result = await session.execute(stmt)
+        written.update(result.scalars())
+    return written
+
+
+async def existing_keys(session: AsyncSession, model, keys: List[Any]) -> Set[Any]:
+    """
+    Return which of the given primary keys already have a row, so upserted
+    keys can be told apart as inserts or updates.
+
+    :param session: The database session.
+    :param model: The ORM model, with a single-column primary key.
+    :param keys: The primary keys to look up.
+    :return: The keys that exist.
+    """
+    if not keys:
+        return set()
+    (primary_key,) = model.__table__.primary_key.columns
+    batch_size = MAX_BIND_PARAMETERS.get(session.bind.dialect.name, len(keys))
+    found = set()
+    for batch in _batches(keys, batch_size):
+        result = await session.execute(
+            select(primary_key).where(primary_key.in_(batch))
+        )
+        found.update(result.scalars())
+    return found
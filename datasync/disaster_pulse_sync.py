@@ -1,18 +1,29 @@
 import asyncio
+import hashlib
 import httpx
-from sqlalchemy import delete, and_, select
+import json
+from collections import Counter
+from sqlalchemy import delete, and_, desc, func, null, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
 from db.session import AsyncSessionLocal
+from db.upsert import bulk_upsert, existing_keys
+from models.analysis import Analysis
 from models.disaster import Disaster
 from models.report import Report
+from models.sync_run import SyncRun
+from models.sync_state import SyncState
 from config import settings
 from api_client import APIClient
 
 logger = logging.getLogger(__name__)
 
+# Change date of rows that have neither a change nor a creation date; listings
+# page through rows by change date, so it is required
+NO_CHANGE_DATE = datetime(1970, 1, 1)
+
 class DisasterPulseSync:
     """
     A class to handle synchronization of disaster data with an external API.
@@ -23,10 +34,38 @@ class DisasterPulseSync:
         Initialize the DisasterPulseSync object.
         """
         self.relief_web_api = APIClient(
-            settings.RELIEF_WEB_API_URL, settings.RELIEFWEB_APP_NAME
+            settings.RELIEF_WEB_API_URL,
+            settings.RELIEFWEB_APP_NAME,
+            requests_per_minute=settings.RELIEFWEB_REQUESTS_PER_MINUTE,
+            burst=settings.RELIEFWEB_BURST,
+            max_retries=settings.RELIEFWEB_MAX_RETRIES,
+            backoff_base=settings.RELIEFWEB_BACKOFF_BASE_SECONDS,
+            max_backoff=settings.RELIEFWEB_MAX_BACKOFF_SECONDS,
+            failure_threshold=settings.RELIEFWEB_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.RELIEFWEB_CIRCUIT_RESET_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.RELIEFWEB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.RELIEFWEB_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.RELIEFWEB_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.RELIEFWEB_CONNECT_TIMEOUT_SECONDS,
+                read=settings.RELIEFWEB_READ_TIMEOUT_SECONDS,
+                write=settings.RELIEFWEB_WRITE_TIMEOUT_SECONDS,
+                pool=settings.RELIEFWEB_POOL_TIMEOUT_SECONDS,
+            ),
+            http2=settings.RELIEFWEB_HTTP2,
         )
         self.retention_period = timedelta(days=settings.RETENTION_PERIOD_DAYS)
         self.api_client = httpx.AsyncClient(base_url=settings.API_BASE_URL, timeout=httpx.Timeout(timeout=60.0))
+        self.analysis_semaphore = asyncio.Semaphore(settings.ANALYSIS_CONCURRENCY)
+        # Rows written by the current sync cycle
+        self.run_changes = Counter()
+        self.run_disaster_ids = set()
+        # Incremental syncs fetch every report again now and then, so that
+        # reports removed from ReliefWeb are pruned
+        self.full_report_sync = True
+        self.last_full_report_sync = None
 
     async def make_api_request(
         self, endpoint: str, params: Dict[str, Any] = None
@@ -34,6 +73,9 @@ class DisasterPulseSync:
         """
         Make a request to the external API and return the response data.
 
+        Retries and rate limiting are handled by the API client; this only
+        turns a final failure into None.
+
         :param endpoint: The API endpoint to request.
         :param params: The parameters to include in the request.
         :return: The response data as a dictionary.
@@ -43,42 +85,63 @@ class DisasterPulseSync:
             return data
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred: {e}")
-            await asyncio.sleep(5)  # Wait before retrying in case of rate limit
             return None
         except httpx.RequestError as e:
             logger.error(f"An error occurred while requesting {e.request.url!r}: {e}")
             return None
 
-    def update_disaster_analysis(self, disaster_id):
+    async def update_disaster_analysis(self, disaster_id, analysis_types):
         """
-        Update the disaster analysis for a given disaster.
+        Update the given types of analysis for a disaster.
 
-        :param disaster: The disaster object to update.
+        :param disaster_id: The ID of the disaster to update.
+        :param analysis_types: The analysis types to update ("report", "map", "news").
         """
-        # Update report analysis
-        self.update_analysis(disaster_id, "report")
-        # Update map analysis
-        self.update_analysis(disaster_id, "map")
-        # Update news analysis
-        self.update_analysis(disaster_id, "news")
+        await asyncio.gather(
+            *(
+                self.update_analysis(disaster_id, analysis_type)
+                for analysis_type in analysis_types
+            )
+        )
 
-    def update_analysis(self, disaster_id, analysis_type: str):
+    async def update_analysis(self, disaster_id, analysis_type: str):
         """
-        Update the specified type of analysis for a disaster.
+        Request the specified type of analysis for a disaster.
+
+        The backend queues the analysis and answers right away, so this does
+        not wait for the analysis to finish. Requests share the pooled API
+        client and are capped by ANALYSIS_CONCURRENCY across all disasters.
 
         :param disaster_id: The ID of the disaster to update.
-        :param analysis_type: The type of analysis to update ("report" or "map").
+        :param analysis_type: The type of analysis to update ("report", "map" or "news").
         """
-        analysis_url = f"/disasters/{disaster_id}/analysis?analysis_type={analysis_type}"
+        analysis_url = f"/disasters/{disaster_id}/analysis"
         try:
-            with httpx.Client(base_url=settings.API_BASE_URL, timeout=httpx.Timeout(timeout=120.0)) as client:
-                response = client.put(analysis_url)
+            async with self.analysis_semaphore:
+                response = await self.api_client.put(
+                    analysis_url,
+                    params={"analysis_type": analysis_type},
+                    timeout=settings.ANALYSIS_TIMEOUT_SECONDS,
+                )
                 response.raise_for_status()
-            logger.info(f"Updated {analysis_type} analysis for disaster ID: {disaster_id}")
+            if response.status_code == 202:
+                logger.info(
+                    f"Queued {analysis_type} analysis for disaster ID: {disaster_id} "
+                    f"(job {response.json()['id']})"
+                )
+            else:
+                logger.info(
+                    f"{analysis_type.capitalize()} analysis already available "
+                    f"for disaster ID: {disaster_id}"
+                )
         except httpx.HTTPStatusError as e:
             logger.warning(
                 f"Failed to update {analysis_type} analysis for disaster ID: {disaster_id}. Error: {e}"
             )
+        except httpx.RequestError as e:
+            logger.warning(
+                f"Request for {analysis_type} analysis of disaster ID: {disaster_id} failed: {e!r}"
+            )
 
     async def sync_disasters(self):
         """
@@ -86,44 +149,108 @@ class DisasterPulseSync:
         """
         params = {
             "filter": {"field": "status", "value": ["alert", "ongoing"]},
-            "profile": "full",
             "sort": ["date:desc"],
-            "limit": settings.DISASTER_LIMIT,
         }
-        disasters_data = await self.make_api_request("disasters", params)
-        if not disasters_data:
-            return
+        if settings.INCREMENTAL_SYNC:
+            # Only list ids and change dates; full payloads are fetched below
+            # for the disasters that actually changed.
+            params["fields"] = {"include": ["id", "date.changed"]}
+        else:
+            params["profile"] = "full"
+
+        started_at = datetime.now(timezone.utc)
+        self.run_changes = Counter()
+        self.run_disaster_ids = set()
+        self.full_report_sync = (
+            self.last_full_report_sync is None
+            or started_at - self.last_full_report_sync
+            >= timedelta(hours=settings.FULL_REPORT_SYNC_HOURS)
+        )
+
+        semaphore = asyncio.Semaphore(settings.SYNC_CONCURRENCY)
+
+        async def sync_with_limit(disaster_fields, upsert_disaster):
+            async with semaphore:
+                return await self.sync_single_disaster(
+                    disaster_fields, upsert_disaster
+                )
 
         active_disaster_ids = []
-        for disaster_item in disasters_data["data"]:
-            try:
-                disaster_id = await self.sync_single_disaster(disaster_item["fields"])
-                if disaster_id:
-                    active_disaster_ids.append(disaster_id)
-            except Exception as e:
-                logger.error(f"Failed to sync disaster: {e}")
-        await self.cleanup_old_data(active_disaster_ids)
+        pending_analyses = {}
+        failed_count = 0
+        listing_complete = True
+        try:
+            async for page in self.relief_web_api.paginate(
+                "disasters",
+                params,
+                page_size=settings.RELIEFWEB_PAGE_SIZE,
+                max_items=settings.DISASTER_LIMIT,
+            ):
+                disaster_listing = [item["fields"] for item in page]
+                if settings.INCREMENTAL_SYNC:
+                    fetched = await self.fetch_changed_disasters(disaster_listing)
+                    disasters_to_sync, unfetched_ids = fetched
+                    if unfetched_ids:
+                        # Still listed, so keep them out of the cleanup
+                        logger.error(
+                            f"Failed to fetch changed disasters: {unfetched_ids}"
+                        )
+                        active_disaster_ids.extend(unfetched_ids)
+                        failed_count += len(unfetched_ids)
+                        listing_complete = False
+                else:
+                    disasters_to_sync = [(fields, True) for fields in disaster_listing]
+
+                results = await asyncio.gather(
+                    *(
+                        sync_with_limit(disaster_fields, upsert_disaster)
+                        for disaster_fields, upsert_disaster in disasters_to_sync
+                    ),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Failed to sync disaster: {result}")
+                        failed_count += 1
+                    elif result:
+                        disaster_id, analysis_types = result
+                        active_disaster_ids.append(disaster_id)
+                        pending_analyses[disaster_id] = analysis_types
+                    else:
+                        failed_count += 1
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            logger.error(f"Failed to list disasters: {e}")
+            listing_complete = False
+
+        logger.info(
+            f"Disaster sync finished: {len(active_disaster_ids)} succeeded, "
+            f"{failed_count} failed"
+        )
+        if listing_complete:
+            await self.cleanup_old_data(active_disaster_ids)
+            if self.full_report_sync:
+                self.last_full_report_sync = started_at
+        else:
+            logger.warning("Skipping cleanup because the disaster listing is incomplete")
+
+        await self.record_sync_run(started_at)
 
-        # Update disaster analysis for each active disaster
-        for disaster_id in active_disaster_ids:
-            self.update_disaster_analysis(disaster_id)
+        # Update missing or invalidated analyses for each active disaster
+        await asyncio.gather(
+            *(
+                self.update_disaster_analysis(disaster_id, analysis_types)
+                for disaster_id, analysis_types in pending_analyses.items()
+            )
+        )
 
 
-    async def update_or_create_disaster(
-        self, session: AsyncSession, disaster_data: Dict[str, Any]
-    ) -> Disaster:
+    def process_disaster_data(self, disaster_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Update or create a disaster record in the database.
+        Map a ReliefWeb disaster payload onto Disaster column values.
 
-        :param session: The database session.
-        :param disaster_data: The disaster data to update or create.
-        :return: The disaster object.
+        :param disaster_data: The disaster data from the API.
+        :return: The column values for the disaster row.
         """
-        result = await session.execute(
-            select(Disaster).where(Disaster.id == disaster_data["id"])
-        )
-        disaster = result.scalar_one_or_none()
-
         processed_data = {
             "id": disaster_data.get("id"),
             "name": disaster_data.get("name"),
@@ -138,90 +265,405 @@ class DisasterPulseSync:
             ),
             "date_changed": self.parse_date(
                 disaster_data.get("date", {}).get("changed")
-            ),
+                or disaster_data.get("date", {}).get("created")
+            )
+            or NO_CHANGE_DATE,
             "date_event": self.parse_date(disaster_data.get("date", {}).get("event")),
             "primary_country": disaster_data.get("primary_country"),
             "affected_countries": disaster_data.get("country", []),
             "primary_type": disaster_data.get("primary_type"),
         }
+        processed_data["content_hash"] = self.content_hash(processed_data)
+        return processed_data
 
-        if disaster:
-            for key, value in processed_data.items():
-                setattr(disaster, key, value)
-        else:
-            disaster = Disaster(**processed_data)
-            session.add(disaster)
-        return disaster
+    async def fetch_changed_disasters(self, disaster_listing):
+        """
+        Compare a lightweight disaster listing against the stored rows and
+        fetch full payloads only for disasters changed since the last sync.
 
-    async def sync_single_disaster(self, disaster_fields):
+        :param disaster_listing: The listed disasters, with id and change date.
+        :return: (disaster fields, changed) pairs for every listed disaster
+            that can be synced, and the IDs of changed disasters whose full
+            payload could not be fetched.
+        """
+        listed_ids = [fields["id"] for fields in disaster_listing]
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Disaster.id, Disaster.date_changed).where(
+                    Disaster.id.in_(listed_ids)
+                )
+            )
+            stored_dates = {
+                disaster_id: self.as_naive(date_changed)
+                for disaster_id, date_changed in result
+            }
+
+        changed_ids = []
+        unchanged = []
+        for fields in disaster_listing:
+            date_changed = self.parse_date(fields.get("date", {}).get("changed"))
+            stored_date = stored_dates.get(fields["id"])
+            if stored_date and date_changed and date_changed <= stored_date:
+                unchanged.append((fields, False))
+            else:
+                changed_ids.append(fields["id"])
+
+        logger.info(
+            f"{len(changed_ids)} disasters changed, {len(unchanged)} unchanged"
+        )
+        if not changed_ids:
+            return unchanged, []
+
+        disasters_data = await self.make_api_request(
+            "disasters",
+            {
+                "filter": {"field": "id", "value": changed_ids},
+                "profile": "full",
+                "limit": len(changed_ids),
+            },
+        )
+        changed = [
+            (item["fields"], True) for item in (disasters_data or {}).get("data", [])
+        ]
+        fetched_ids = {fields["id"] for fields, _ in changed}
+        unfetched_ids = [i for i in changed_ids if i not in fetched_ids]
+        return changed + unchanged, unfetched_ids
+
+    async def sync_single_disaster(self, disaster_fields, upsert_disaster: bool = True):
         """
         Synchronize a single disaster with the external API.
 
         :param disaster_fields: The disaster data to sync.
-        :return: The ID of the synchronized disaster.
+        :param upsert_disaster: Whether the disaster row itself needs writing;
+            reports are synchronized either way.
+        :return: The ID of the synchronized disaster and the analysis types
+            that are missing or were invalidated.
         """
         async with AsyncSessionLocal() as session:
             try:
                 async with session.begin():
-                    disaster = await self.update_or_create_disaster(session, disaster_fields)
-                    await self.sync_disaster_reports(session, disaster)
-                    await session.commit()  # Add this line to commit the changes
-                    logger.info(f"Synchronized disaster ID: {disaster.id}")
-                return disaster.id
+                    disaster_id = disaster_fields["id"]
+                    changes = Counter()
+                    if upsert_disaster:
+                        disaster_data = self.process_disaster_data(disaster_fields)
+                        existing = await existing_keys(session, Disaster, [disaster_id])
+                        written = await bulk_upsert(session, Disaster, [disaster_data])
+                        self.count_writes(changes, written, existing)
+                    changes.update(
+                        await self.sync_disaster_reports(session, disaster_id)
+                    )
+                    analysis_types = await self.get_missing_analyses(
+                        session, disaster_id
+                    )
+                    logger.info(f"Synchronized disaster ID: {disaster_id}")
+                # Only count the changes once they are committed
+                self.run_changes.update(changes)
+                if any(changes.values()):
+                    self.run_disaster_ids.add(disaster_id)
+                return disaster_id, analysis_types
             except Exception as e:
                 logger.error(f"Error syncing disaster {disaster_fields.get('id')}: {e}")
                 return None
             
-    async def sync_disaster_reports(self, session: AsyncSession, disaster: Disaster):
+    async def sync_disaster_reports(self, session: AsyncSession, disaster_id: int):
         """
         Synchronize the disaster reports for a given disaster.
 
         :param session: The database session.
-        :param disaster: The disaster object to sync reports for.
+        :param disaster_id: The ID of the disaster to sync reports for.
+        :return: The number of reports inserted, updated and deleted.
         """
-        params = {
-            "filter": {
-                "operator": "AND",
-                "conditions": [
-                    {"field": "disaster.id", "value": disaster.id},
-                    {
-                        "field": "format.id",
-                        "value": [
-                            settings.CONTENT_FORMAT_SITUATION_REPORT,
-                            settings.CONTENT_FORMAT_MAP,
-                            settings.CONTENT_FORMAT_NEWS,
-                        ],
-                    },
+        changes = Counter()
+        watermark_key = f"reports:{disaster_id}"
+        watermark = None
+        if settings.INCREMENTAL_SYNC and not self.full_report_sync:
+            watermark = await self.get_watermark(session, watermark_key)
+
+        conditions = [
+            {"field": "disaster.id", "value": disaster_id},
+            {
+                "field": "format.id",
+                "value": [
+                    settings.CONTENT_FORMAT_SITUATION_REPORT,
+                    settings.CONTENT_FORMAT_MAP,
+                    settings.CONTENT_FORMAT_NEWS,
                 ],
             },
+        ]
+        if watermark:
+            conditions.append(
+                {"field": "date.changed", "value": {"from": self.format_date(watermark)}}
+            )
+        # Reports older than the retention period would be deleted right away.
+        cutoff_date = datetime.now() - self.retention_period
+        conditions.append(
+            {"field": "date.created", "value": {"from": self.format_date(cutoff_date)}}
+        )
+        params = {
+            "filter": {"operator": "AND", "conditions": conditions},
             "profile": "full",
-            "sort": ["date:desc"],
-            "limit": 30,  # Adjust this value as needed
+            # Deltas are walked oldest change first so the watermark only
+            # advances past changes that were actually stored.
+            "sort": ["date.changed:asc"] if watermark else ["date:desc"],
         }
-        reports_data = await self.make_api_request("reports", params)
-        if not reports_data:
-            return
 
         synced_report_ids = []
-        for report_item in reports_data["data"]:
-            report_data = report_item["fields"]
-            report = await self.update_or_create_report(
-                session, disaster.id, report_data
+        changed_reports = {}
+        latest_change = None
+        complete = True
+        try:
+            async for page in self.relief_web_api.paginate(
+                "reports",
+                params,
+                page_size=settings.RELIEFWEB_PAGE_SIZE,
+                max_items=settings.REPORT_LIMIT,
+            ):
+                report_rows = [
+                    self.process_report_data(disaster_id, report_item["fields"])
+                    for report_item in page
+                ]
+                if watermark:
+                    # The date filter is inclusive and reports changed at the
+                    # watermark may not all have been stored; writing the ones
+                    # that were again is a no-op thanks to their content hash.
+                    report_rows = [
+                        row
+                        for row in report_rows
+                        if row["date_changed"] and row["date_changed"] >= watermark
+                    ]
+                existing = await existing_keys(
+                    session, Report, [row["id"] for row in report_rows]
+                )
+                changed_report_ids = await bulk_upsert(session, Report, report_rows)
+                self.count_writes(changes, changed_report_ids, existing)
+                for row in report_rows:
+                    synced_report_ids.append(row["id"])
+                    if row["id"] in changed_report_ids:
+                        changed_reports[row["id"]] = row["content_format_id"]
+                    if row["date_changed"] and (
+                        latest_change is None or row["date_changed"] > latest_change
+                    ):
+                        latest_change = row["date_changed"]
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            logger.error(f"Failed to fetch reports for disaster ID: {disaster_id}: {e}")
+            complete = False
+
+        logger.info(
+            f"Synchronized {len(synced_report_ids)} reports for disaster ID: {disaster_id} "
+            f"({len(changed_reports)} written)"
+        )
+        # Reports missing from a complete full fetch were removed upstream. A
+        # delta or partial fetch says nothing about reports left out of it.
+        pruned_reports = {}
+        if complete and not watermark:
+            result = await session.execute(
+                select(Report.id, Report.content_format_id).where(
+                    Report.disaster_id == disaster_id,
+                    Report.id.notin_(synced_report_ids),
+                )
             )
-            synced_report_ids.append(report.id)
+            pruned_reports = dict(result.all())
+
+        # Analyses built from pruned reports are as stale as those of changed
+        # ones; this runs before the delete so their formats can be checked
+        await self.invalidate_stale_analyses(
+            session, disaster_id, {**changed_reports, **pruned_reports}
+        )
+
+        # A partial full fetch is newest first, so its latest change says
+        # nothing about the older reports that were not reached.
+        if settings.INCREMENTAL_SYNC and latest_change and (complete or watermark):
+            await self.set_watermark(session, watermark_key, latest_change)
+
+        if pruned_reports:
+            deleted = await session.execute(
+                delete(Report).where(Report.id.in_(list(pruned_reports)))
+            )
+            changes["deleted"] += deleted.rowcount
+        return changes
+
+    @staticmethod
+    def count_writes(changes: Counter, written: Set[int], existing: Set[int]):
+        """
+        Count upserted rows as inserted or updated.
+
+        :param changes: The counts to add to.
+        :param written: The primary keys of the rows inserted or updated.
+        :param existing: The primary keys that had a row before the upsert.
+        """
+        changes["inserted"] += len(written - existing)
+        changes["updated"] += len(written & existing)
+
+    async def record_sync_run(self, started_at: datetime):
+        """
+        Record the completed sync cycle and notify the backend.
+
+        On PostgreSQL a NOTIFY on SYNC_NOTIFY_CHANNEL carrying the run ID is
+        delivered to listening backend processes when the run is committed,
+        so they refresh caches exactly when the data has changed.
+
+        :param started_at: When the cycle started.
+        """
+        async with AsyncSessionLocal() as session:
+            try:
+                async with session.begin():
+                    run = SyncRun(
+                        started_at=started_at,
+                        inserted=self.run_changes["inserted"],
+                        updated=self.run_changes["updated"],
+                        deleted=self.run_changes["deleted"],
+                        disaster_ids=sorted(self.run_disaster_ids),
+                    )
+                    session.add(run)
+                    await session.flush()
+                    if session.bind.dialect.name == "postgresql":
+                        await session.execute(
+                            select(
+                                func.pg_notify(settings.SYNC_NOTIFY_CHANNEL, str(run.id))
+                            )
+                        )
+                logger.info(
+                    f"Recorded sync run {run.id}: {run.inserted} inserted, "
+                    f"{run.updated} updated, {run.deleted} deleted across "
+                    f"{len(run.disaster_ids)} disasters"
+                )
+            except Exception as e:
+                logger.error(f"Error recording sync run: {e}")
+
+    async def invalidate_stale_analyses(
+        self, session: AsyncSession, disaster_id: int, changed_reports: Dict[int, int]
+    ):
+        """
+        Clear the analyses whose source report was just inserted, changed or
+        is about to be pruned.
+
+        Cached per-language analyses of those reports are deleted. The English
+        analysis on the disaster is built from the latest report of its content
+        format, so it is only stale when that latest report is among them.
+
+        :param session: The database session.
+        :param disaster_id: The ID of the disaster the reports belong to.
+        :param changed_reports: The content format ID of each report written
+            or to be pruned.
+        """
+        # Cached analyses of a report that changed no longer match its content
+        deleted = await session.execute(
+            delete(Analysis).where(
+                Analysis.source_report_id.in_(list(changed_reports))
+            )
+        )
+        if deleted.rowcount:
             logger.info(
-                f"Synchronized report ID: {report.id} for disaster ID: {disaster.id}"
+                f"Deleted {deleted.rowcount} cached analyses for disaster ID: {disaster_id}"
             )
 
-        # Delete old reports not in the latest sync
-        await session.execute(
-            delete(Report).where(
-                and_(
-                    Report.disaster_id == disaster.id,
-                    Report.id.notin_(synced_report_ids),
+        analysis_formats = self.analysis_formats()
+        changed_formats = set(changed_reports.values()) & analysis_formats.keys()
+        stale_columns = {}
+        for format_id in changed_formats:
+            result = await session.execute(
+                select(Report.id)
+                .where(
+                    Report.disaster_id == disaster_id,
+                    Report.content_format_id == format_id,
                 )
+                .order_by(desc(Report.date_created))
+                .limit(1)
             )
+            if result.scalar_one_or_none() in changed_reports:
+                stale_columns[analysis_formats[format_id]] = null()
+
+        if stale_columns:
+            await session.execute(
+                update(Disaster)
+                .where(Disaster.id == disaster_id)
+                .values(**stale_columns)
+            )
+            logger.info(
+                f"Invalidated {', '.join(stale_columns)} for disaster ID: {disaster_id}"
+            )
+
+    async def get_missing_analyses(
+        self, session: AsyncSession, disaster_id: int
+    ) -> List[str]:
+        """
+        Get the analysis types that have not been computed for a disaster.
+
+        :param session: The database session.
+        :param disaster_id: The ID of the disaster.
+        :return: The missing analysis types ("report", "map", "news").
+        """
+        result = await session.execute(
+            select(
+                Disaster.report_analysis.is_(None),
+                Disaster.map_analysis.is_(None),
+                Disaster.news_analysis.is_(None),
+            ).where(Disaster.id == disaster_id)
         )
+        missing = result.one()
+        return [
+            analysis_type
+            for analysis_type, is_missing in zip(("report", "map", "news"), missing)
+            if is_missing
+        ]
+
+    @staticmethod
+    def analysis_formats() -> Dict[int, str]:
+        """
+        Map each analyzed content format to the Disaster column built from it.
+
+        :return: The analysis column name for each content format ID.
+        """
+        return {
+            settings.CONTENT_FORMAT_SITUATION_REPORT: "report_analysis",
+            settings.CONTENT_FORMAT_MAP: "map_analysis",
+            settings.CONTENT_FORMAT_NEWS: "news_analysis",
+        }
+
+    async def get_watermark(self, session: AsyncSession, key: str) -> Optional[datetime]:
+        """
+        Get the stored high-water mark for a feed.
+
+        :param session: The database session.
+        :param key: The feed key.
+        :return: The latest change date already synchronized, if any.
+        """
+        result = await session.execute(
+            select(SyncState.watermark).where(SyncState.key == key)
+        )
+        return self.as_naive(result.scalar_one_or_none())
+
+    async def set_watermark(self, session: AsyncSession, key: str, value: datetime):
+        """
+        Store the high-water mark for a feed.
+
+        :param session: The database session.
+        :param key: The feed key.
+        :param value: The latest change date synchronized.
+        """
+        await bulk_upsert(session, SyncState, [{"key": key, "watermark": value}])
+
+    @staticmethod
+    def as_naive(value: Optional[datetime]) -> Optional[datetime]:
+        """
+        Convert a stored datetime to the timezone-naive UTC form used by parse_date.
+
+        :param value: The datetime to convert.
+        :return: The timezone-naive datetime.
+        """
+        if value and value.tzinfo:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def format_date(value: datetime) -> str:
+        """
+        Format a timezone-naive UTC datetime for ReliefWeb date filters.
+
+        :param value: The datetime to format.
+        :return: The ISO format date string.
+        """
+        return value.replace(tzinfo=timezone.utc).isoformat()
 
     @staticmethod
     def parse_date(date_string: str) -> datetime:
@@ -236,22 +678,16 @@ class DisasterPulseSync:
             return dt.replace(tzinfo=None)  # Convert to timezone-naive
         return None
 
-    async def update_or_create_report(
-        self, session: AsyncSession, disaster_id: int, report_data: Dict[str, Any]
-    ) -> Report:
+    def process_report_data(
+        self, disaster_id: int, report_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
-        Update or create a report record in the database.
+        Map a ReliefWeb report payload onto Report column values.
 
-        :param session: The database session.
         :param disaster_id: The ID of the associated disaster.
-        :param report_data: The report data to update or create.
-        :return: The report object.
+        :param report_data: The report data from the API.
+        :return: The column values for the report row.
         """
-        result = await session.execute(
-            select(Report).where(Report.id == report_data["id"])
-        )
-        report = result.scalar_one_or_none()
-
         processed_data = {
             "id": report_data.get("id"),
             "disaster_id": disaster_id,
@@ -260,7 +696,11 @@ class DisasterPulseSync:
             "url": report_data.get("url"),
             "url_alias": report_data.get("url_alias"),
             "date_created": self.parse_date(report_data.get("date", {}).get("created")),
-            "date_changed": self.parse_date(report_data.get("date", {}).get("changed")),
+            "date_changed": self.parse_date(
+                report_data.get("date", {}).get("changed")
+                or report_data.get("date", {}).get("created")
+            )
+            or NO_CHANGE_DATE,
             "date_original": self.parse_date(
                 report_data.get("date", {}).get("original")
             ),
@@ -271,6 +711,8 @@ class DisasterPulseSync:
             "file": report_data.get("file"),
             "primary_country": report_data.get("primary_country"),
             "affected_countries": report_data.get("country", []),
+            "content_format_id": None,
+            "content_format_name": None,
         }
 
         # Extract format id and name
@@ -278,13 +720,23 @@ class DisasterPulseSync:
             processed_data["content_format_id"] = report_data["format"][0].get("id")
             processed_data["content_format_name"] = report_data["format"][0].get("name")
 
-        if report:
-            for key, value in processed_data.items():
-                setattr(report, key, value)
-        else:
-            report = Report(**processed_data)
-            session.add(report)
-        return report
+        processed_data["content_hash"] = self.content_hash(processed_data)
+        # Extracted text and images belong to the old content; they are only
+        # written when the row is inserted or its hash changed.
+        processed_data["extracted_report"] = null()
+        processed_data["extracted_maps"] = null()
+        return processed_data
+
+    @staticmethod
+    def content_hash(processed_data: Dict[str, Any]) -> str:
+        """
+        Fingerprint the synchronized columns of a row.
+
+        :param processed_data: The column values for the row.
+        :return: The SHA-256 hex digest of the values.
+        """
+        payload = json.dumps(processed_data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     async def cleanup_old_data(self, active_disaster_ids):
         """
@@ -296,15 +748,37 @@ class DisasterPulseSync:
             try:
                 async with session.begin():
                     cutoff_date = datetime.now() - self.retention_period
-                    await session.execute(
-                        delete(Disaster).where(
+                    deleted_disasters = await session.execute(
+                        delete(Disaster)
+                        .where(
                             and_(
                                 Disaster.id.notin_(active_disaster_ids),
                                 Disaster.date_created < cutoff_date,
                             )
                         )
+                        .returning(Disaster.id)
+                    )
+                    deleted_reports = await session.execute(
+                        delete(Report)
+                        .where(Report.date_created < cutoff_date)
+                        .returning(Report.disaster_id)
                     )
-                    await session.execute(delete(Report).where(Report.date_created < cutoff_date))
+                    disaster_ids = set(deleted_disasters.scalars())
+                    report_disaster_ids = list(deleted_reports.scalars())
+                    await session.execute(
+                        delete(SyncState).where(
+                            and_(
+                                SyncState.key.like("reports:%"),
+                                SyncState.key.notin_(
+                                    [f"reports:{i}" for i in active_disaster_ids]
+                                ),
+                            )
+                        )
+                    )
+                self.run_changes["deleted"] += len(disaster_ids) + len(
+                    report_disaster_ids
+                )
+                self.run_disaster_ids.update(disaster_ids, report_disaster_ids)
             except Exception as e:
                 logger.error(f"Error cleaning up old data: {e}")
 
@@ -319,6 +793,8 @@ class DisasterPulseSync:
             except Exception as e:
                 logger.error(f"Sync failed: {str(e)}", exc_info=True)
             finally:
+                logger.info(f"ReliefWeb client stats: {self.relief_web_api.stats}")
+                self.relief_web_api.reset_stats()
                 await asyncio.sleep(
                     timedelta(hours=settings.SYNC_INTERVAL_HOURS).total_seconds()
                 )
@@ -1,13 +1,9 @@
 import asyncio
 from disaster_pulse_sync import DisasterPulseSync
-from db.session import engine
-from models.base import Base
 
 
 async def main():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
+    # The schema is created and migrated by the backend
     sync_manager = DisasterPulseSync()
     await sync_manager.start()
 
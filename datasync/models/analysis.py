@@ -0,0 +1,33 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    JSON,
+    String,
+    UniqueConstraint,
+    func,
+)
+from .base import Base
+
+
+class Analysis(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    disaster_id = Column(
+        Integer, ForeignKey("disaster.id", ondelete="CASCADE"), nullable=False
+    )
+    analysis_type = Column(String, nullable=False)
+    lang = Column(String, nullable=False)
+    source_report_id = Column(
+        Integer, ForeignKey("report.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    result = Column(JSON, nullable=False)
+    usage = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("disaster_id", "analysis_type", "lang", "source_report_id"),
+    )
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -13,7 +22,7 @@ class Report(Base):
     status = Column(String, index=True)
 
     date_created = Column(DateTime(timezone=True), index=True)
-    date_changed = Column(DateTime(timezone=True))
+    date_changed = Column(DateTime(timezone=True), nullable=False)
     date_original = Column(DateTime(timezone=True))
     primary_country = Column(JSON)
     affected_countries = Column(JSON)
@@ -21,6 +30,7 @@ class Report(Base):
     source = Column(JSON)
     theme = Column(JSON)
     file = Column(JSON)
+    content_hash = Column(String(64))
     extracted_report = Column(Text)
     extracted_maps = Column(JSON)
 
@@ -28,3 +38,18 @@ class Report(Base):
     content_format_name = Column(String, index=True)
 
     disaster = relationship("Disaster", back_populates="reports")
+
+    __table_args__ = (
+        # Latest report of a format for a disaster (analysis endpoints)
+        Index(
+            "ix_report_disaster_id_content_format_id_date_created",
+            "disaster_id",
+            "content_format_id",
+            "date_created",
+        ),
+        # Keyset pagination of the listing endpoints
+        Index("ix_report_date_changed_id", "date_changed", "id"),
+        Index(
+            "ix_report_disaster_id_date_changed_id", "disaster_id", "date_changed", "id"
+        ),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Integer, JSON, func
+from .base import Base
+
+
+class SyncRun(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), server_default=func.now())
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    deleted = Column(Integer, nullable=False, default=0)
+    disaster_ids = Column(JSON, nullable=False, default=list)
@@ -0,0 +1,7 @@
+from sqlalchemy import Column, String, DateTime
+from .base import Base
+
+
+class SyncState(Base):
+    key = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True))
@@ -0,0 +1,33 @@
+import os
+
+# Settings are read at import time, so they must exist before any datasync
+# module is imported.
+os.environ.setdefault("RELIEFWEB_APP_NAME", "disasterpulse-tests")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("API_BASE_URL", "http://backend.test")
+os.environ.setdefault("SYNC_INTERVAL_HOURS", "1")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+import models.analysis  # noqa: F401
+import models.disaster  # noqa: F401
+import models.report  # noqa: F401
+import models.sync_run  # noqa: F401
+import models.sync_state  # noqa: F401
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
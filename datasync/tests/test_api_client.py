@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from api_client import APIClient, CircuitBreaker
+
+pytestmark = pytest.mark.anyio
+
+
+def client_with(handler, **kwargs):
+    client = APIClient("https://api.test", "tests", **kwargs)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+async def test_backoff_honors_retry_after_above_the_cap():
+    client = APIClient("https://api.test", "tests", max_backoff=60.0)
+    try:
+        assert client.backoff_delay(10) <= 60.0
+        assert client.backoff_delay(0, retry_after=120.0) == 120.0
+    finally:
+        await client.close()
+
+
+async def test_post_retries_server_errors():
+    responses = iter([503, 200])
+
+    def handler(request):
+        status = next(responses)
+        return httpx.Response(status, json={"data": []}, headers={"Retry-After": "0"})
+
+    client = client_with(handler, backoff_base=0.0)
+    try:
+        assert await client.post("disasters") == {"data": []}
+        assert client.stats["retries"] == 1
+    finally:
+        await client.close()
+
+
+async def test_post_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400)
+
+    client = client_with(handler)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.post("disasters")
+        assert len(calls) == 1
+    finally:
+        await client.close()
+
+
+async def test_circuit_opens_at_the_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.opened_at is not None
+    breaker.record_success()
+    assert breaker.opened_at is None and breaker.failures == 0
+
+
+async def test_half_open_circuit_lets_a_single_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - 60.0
+
+    waiters = [asyncio.create_task(breaker.wait()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    trials = [waiter.result() for waiter in waiters if waiter.done()]
+    assert trials == [True]
+
+    breaker.record_success(trial=True)
+    await asyncio.sleep(0.01)
+    assert [waiter.result() for waiter in waiters] == [True, False, False]
+
+
+async def test_failed_trial_opens_the_circuit_again():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    breaker.failures = 3
+    breaker.opened_at = time.monotonic() - 60.0
+
+    assert await breaker.wait()
+    waiter = asyncio.create_task(breaker.wait())
+    await asyncio.sleep(0.01)
+    assert breaker.record_failure(trial=True)
+    await asyncio.sleep(0.01)
+
+    # The others keep waiting out the new reset timeout
+    assert not waiter.done()
+    waiter.cancel()
@@ -0,0 +1,265 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+import disaster_pulse_sync
+from db.upsert import bulk_upsert
+from disaster_pulse_sync import DisasterPulseSync
+from models.analysis import Analysis
+from models.disaster import Disaster
+from models.report import Report
+
+pytestmark = pytest.mark.anyio
+
+
+def listed(disaster_id, changed="2024-07-01T00:00:00+00:00"):
+    return {"fields": {"id": disaster_id, "date": {"changed": changed}}}
+
+
+def report(report_id, changed, created=None, format_id=10):
+    created = created or datetime.now(timezone.utc).isoformat()
+    return {
+        "fields": {
+            "id": report_id,
+            "title": f"Report {report_id}",
+            "date": {"created": created, "changed": changed},
+            "format": [{"id": format_id, "name": "Situation Report"}],
+        }
+    }
+
+
+def serve_reports(sync, monkeypatch, *pages):
+    requests = []
+
+    async def paginate(endpoint, params, **kwargs):
+        requests.append(params)
+        for page in pages:
+            yield page
+
+    monkeypatch.setattr(sync.relief_web_api, "paginate", paginate)
+    return requests
+
+
+async def stored_report_ids(session_factory):
+    async with session_factory() as session:
+        return set((await session.execute(select(Report.id))).scalars())
+
+
+@pytest.fixture
+async def sync(session_factory, monkeypatch):
+    monkeypatch.setattr(disaster_pulse_sync, "AsyncSessionLocal", session_factory)
+    sync = DisasterPulseSync()
+    yield sync
+    await sync.close()
+
+
+async def test_unfetched_changed_disasters_are_reported(sync, session_factory):
+    async with session_factory() as session:
+        async with session.begin():
+            await bulk_upsert(
+                session,
+                Disaster,
+                [
+                    {"id": 1, "date_changed": sync.parse_date("2024-07-01T00:00:00")},
+                    {"id": 2, "date_changed": sync.parse_date("2024-06-01T00:00:00")},
+                ],
+            )
+
+    async def make_api_request(endpoint, params):
+        # The full profile of disaster 3 is missing from the response
+        return {"data": [{"fields": {"id": 2, "name": "Flood"}}]}
+
+    sync.make_api_request = make_api_request
+    listing = [listed(1)["fields"], listed(2)["fields"], listed(3)["fields"]]
+    disasters, unfetched_ids = await sync.fetch_changed_disasters(listing)
+
+    assert [(fields["id"], changed) for fields, changed in disasters] == [
+        (2, True),
+        (1, False),
+    ]
+    assert unfetched_ids == [3]
+
+
+async def test_failed_detail_fetch_skips_cleanup(sync, monkeypatch):
+    async def paginate(endpoint, params, **kwargs):
+        yield [listed(1), listed(2)]
+
+    async def make_api_request(endpoint, params):
+        return None
+
+    async def sync_single_disaster(disaster_fields, upsert_disaster=True):
+        return disaster_fields["id"], []
+
+    cleanups = []
+
+    async def cleanup_old_data(active_disaster_ids):
+        cleanups.append(active_disaster_ids)
+
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(disaster_pulse_sync.settings, "INCREMENTAL_SYNC", True)
+    monkeypatch.setattr(sync.relief_web_api, "paginate", paginate)
+    sync.make_api_request = make_api_request
+    sync.sync_single_disaster = sync_single_disaster
+    sync.cleanup_old_data = cleanup_old_data
+    sync.record_sync_run = noop
+    sync.update_disaster_analysis = noop
+
+    await sync.sync_disasters()
+
+    assert cleanups == []
+
+
+async def test_delta_keeps_reports_changed_at_the_watermark(
+    sync, session_factory, monkeypatch
+):
+    watermark = "2024-07-01T00:00:00+00:00"
+    async with session_factory() as session:
+        async with session.begin():
+            await sync.set_watermark(session, "reports:1", sync.parse_date(watermark))
+
+    # Report 2 shares the watermark's change date with a report stored by a
+    # fetch that stopped partway
+    requests = serve_reports(
+        sync,
+        monkeypatch,
+        [report(2, watermark), report(3, "2024-07-02T00:00:00+00:00")],
+    )
+    monkeypatch.setattr(disaster_pulse_sync.settings, "INCREMENTAL_SYNC", True)
+    sync.full_report_sync = False
+    async with session_factory() as session:
+        async with session.begin():
+            changes = await sync.sync_disaster_reports(session, 1)
+
+    assert requests[0]["sort"] == ["date.changed:asc"]
+    assert changes["inserted"] == 2
+    assert await stored_report_ids(session_factory) == {2, 3}
+
+
+async def test_full_report_sync_prunes_reports_removed_upstream(
+    sync, session_factory, monkeypatch
+):
+    async with session_factory() as session:
+        async with session.begin():
+            await sync.set_watermark(
+                session, "reports:1", sync.parse_date("2024-07-01T00:00:00")
+            )
+            await bulk_upsert(
+                session,
+                Report,
+                [
+                    {
+                        "id": report_id,
+                        "disaster_id": 1,
+                        "date_changed": datetime(2024, 6, 1),
+                    }
+                    for report_id in (1, 2)
+                ],
+            )
+
+    requests = serve_reports(
+        sync, monkeypatch, [report(2, "2024-07-02T00:00:00+00:00")]
+    )
+    monkeypatch.setattr(disaster_pulse_sync.settings, "INCREMENTAL_SYNC", True)
+    sync.full_report_sync = True
+    async with session_factory() as session:
+        async with session.begin():
+            changes = await sync.sync_disaster_reports(session, 1)
+
+    assert requests[0]["sort"] == ["date:desc"]
+    assert changes["deleted"] == 1
+    assert await stored_report_ids(session_factory) == {2}
+
+
+async def test_full_report_sync_runs_once_per_interval(sync, monkeypatch):
+    async def paginate(endpoint, params, **kwargs):
+        yield []
+
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(sync.relief_web_api, "paginate", paginate)
+    sync.cleanup_old_data = noop
+    sync.record_sync_run = noop
+
+    full_syncs = []
+    for _ in range(3):
+        await sync.sync_disasters()
+        full_syncs.append(sync.full_report_sync)
+    sync.last_full_report_sync -= timedelta(
+        hours=disaster_pulse_sync.settings.FULL_REPORT_SYNC_HOURS
+    )
+    await sync.sync_disasters()
+    full_syncs.append(sync.full_report_sync)
+
+    assert full_syncs == [True, False, False, True]
+
+
+async def test_pruning_the_latest_report_invalidates_its_analyses(
+    sync, session_factory, monkeypatch
+):
+    async with session_factory() as session:
+        async with session.begin():
+            await bulk_upsert(
+                session,
+                Disaster,
+                [
+                    {
+                        "id": 1,
+                        "date_changed": datetime(2024, 6, 1),
+                        "report_analysis": {"summary": "x"},
+                    }
+                ],
+            )
+            await bulk_upsert(
+                session,
+                Report,
+                [
+                    {
+                        "id": report_id,
+                        "disaster_id": 1,
+                        "content_format_id": 10,
+                        "date_created": sync.parse_date(created),
+                        "date_changed": sync.parse_date(created),
+                    }
+                    for report_id, created in ((1, "2024-07-01"), (2, "2024-06-01"))
+                ],
+            )
+            session.add(
+                Analysis(
+                    disaster_id=1,
+                    analysis_type="report",
+                    lang="fr",
+                    source_report_id=1,
+                    result={"summary": "x"},
+                )
+            )
+
+    # The latest report, 1, was removed upstream
+    serve_reports(
+        sync,
+        monkeypatch,
+        [report(2, "2024-06-01T00:00:00+00:00", "2024-06-01T00:00:00+00:00")],
+    )
+    sync.full_report_sync = True
+    async with session_factory() as session:
+        async with session.begin():
+            await sync.sync_disaster_reports(session, 1)
+
+    async with session_factory() as session:
+        disaster = await session.get(Disaster, 1)
+        analyses = (await session.execute(select(Analysis))).scalars().all()
+    assert disaster.report_analysis is None
+    assert analyses == []
+    assert await stored_report_ids(session_factory) == {2}
+
+
+async def test_missing_change_date_falls_back_to_creation_date(sync):
+    created = "2024-06-01T00:00:00+00:00"
+    row = sync.process_report_data(1, {"id": 5, "date": {"created": created}})
+    assert row["date_changed"] == sync.parse_date(created)
+
+    row = sync.process_disaster_data({"id": 1})
+    assert row["date_changed"] == disaster_pulse_sync.NO_CHANGE_DATE
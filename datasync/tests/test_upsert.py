@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from db.upsert import MAX_BIND_PARAMETERS, bulk_upsert, existing_keys
+from models.disaster import Disaster
+from models.sync_state import SyncState
+
+pytestmark = pytest.mark.anyio
+
+
+def disaster_row(disaster_id, name="Flood", content_hash=None):
+    return {
+        "id": disaster_id,
+        "name": name,
+        "status": "ongoing",
+        "date_changed": datetime(2024, 7, 1),
+        "content_hash": content_hash or f"hash-{name}",
+    }
+
+
+async def test_bulk_upsert_inserts_and_updates_in_one_statement(session_factory):
+    async with session_factory() as session:
+        async with session.begin():
+            written = await bulk_upsert(
+                session, Disaster, [disaster_row(1), disaster_row(2)]
+            )
+        assert written == {1, 2}
+
+        async with session.begin():
+            written = await bulk_upsert(
+                session, Disaster, [disaster_row(2, "Cyclone"), disaster_row(3)]
+            )
+        assert written == {2, 3}
+
+        names = dict((await session.execute(select(Disaster.id, Disaster.name))).all())
+        assert names == {1: "Flood", 2: "Cyclone", 3: "Flood"}
+
+
+async def test_bulk_upsert_batches_rows_within_the_bind_parameter_limit(
+    session_factory, monkeypatch
+):
+    # 5 columns per row, so at most 2 rows per statement
+    monkeypatch.setitem(MAX_BIND_PARAMETERS, "sqlite", 11)
+    rows = [disaster_row(disaster_id) for disaster_id in range(1, 8)]
+    async with session_factory() as session:
+        async with session.begin():
+            assert await bulk_upsert(session, Disaster, rows) == set(range(1, 8))
+            assert await existing_keys(session, Disaster, list(range(20))) == set(
+                range(1, 8)
+            )
+
+
+async def test_bulk_upsert_writes_pages_larger_than_one_statement(session_factory):
+    rows = [disaster_row(disaster_id) for disaster_id in range(1, 2001)]
+    async with session_factory() as session:
+        async with session.begin():
+            assert len(await bulk_upsert(session, Disaster, rows)) == 2000
+
+
+async def test_bulk_upsert_without_content_hash_always_updates(session_factory):
+    async with session_factory() as session:
+        async with session.begin():
+            await bulk_upsert(
+                session, SyncState, [{"key": "disasters", "watermark": None}]
+            )
+        async with session.begin():
+            written = await bulk_upsert(
+                session, SyncState, [{"key": "disasters", "watermark": None}]
+            )
+        assert written == {"disasters"}
+
+
+async def test_bulk_upsert_ignores_empty_batches(session_factory):
+    async with session_factory() as session:
+        assert await bulk_upsert(session, Disaster, []) == set()
+
+
+async def test_existing_keys(session_factory):
+    async with session_factory() as session:
+        async with session.begin():
+            await bulk_upsert(session, Disaster, [disaster_row(1), disaster_row(2)])
+        assert await existing_keys(session, Disaster, [1, 3]) == {1}
+        assert await existing_keys(session, Disaster, []) == set()
+
+
+async def test_bulk_upsert_skips_rows_with_unchanged_content_hash(session_factory):
+    async with session_factory() as session:
+        async with session.begin():
+            await bulk_upsert(session, Disaster, [disaster_row(1), disaster_row(2)])
+        async with session.begin():
+            written = await bulk_upsert(
+                session,
+                Disaster,
+                [
+                    disaster_row(1),
+                    disaster_row(2, "Flood", content_hash="new-hash"),
+                ],
+            )
+        assert written == {2}